@@ -0,0 +1,303 @@
+"""Offline benchmarks for the scraping and storage paths.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py                  # compare against baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1000     # quick run
+    python benchmarks/run_benchmarks.py --update-baseline
+
+Exits with status 1 when a stage is slower than its baseline by more than
+the tolerance, makes more WebDriver round trips than the baseline, or has
+no baseline entry.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import threading
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_SIZES = [1000, 100000, 1000000]
+# Readiness waits poll, so a slow page can add a round trip or two without a code change
+WEBDRIVER_CALL_SLACK = 2
+
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+from server import start_server  # noqa: E402
+
+
+def synthetic_jobs(count, offset=0):
+    """Yield ``count`` synthetic jobs with unique numeric IDs."""
+    for i in range(offset, offset + count):
+        job_id = str(3000000000 + i)
+        yield {
+            'job_id': job_id,
+            'title': f'Software Engineering Intern {i % 997}',
+            'link': f'https://www.linkedin.com/jobs/view/{job_id}/?refId=r{i}&trackingId=t{i}',
+            'company': f'Company {i % 211}',
+            'location': 'Tel Aviv-Yafo, Israel',
+            'listed_time': '2026-10-01'
+        }
+
+
+def current_rss():
+    """Return this process's resident memory in bytes."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+class PeakRssSampler:
+    """Samples RSS in a background thread to find a stage's peak memory."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.peak = max(self.peak, current_rss())
+            self.stopped.wait(self.interval)
+
+    def __enter__(self):
+        self.start_rss = current_rss()
+        self.peak = self.start_rss
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+class Bench:
+    """Collects per-stage latency, peak memory and WebDriver round trips."""
+
+    def __init__(self):
+        self.results = {}
+
+    def measure(self, name, func, webdriver_counter=None):
+        print(f"Running {name}...", flush=True)
+        calls_before = webdriver_counter['calls'] if webdriver_counter else 0
+        with PeakRssSampler() as sampler:
+            start = time.perf_counter()
+            value = func()
+            seconds = time.perf_counter() - start
+        # Peak memory is reported as growth over the RSS at the start of the stage
+        peak_mb = (sampler.peak - sampler.start_rss) / (1024 * 1024)
+        result = {'seconds': round(seconds, 4), 'peak_mb': round(peak_mb, 2)}
+        if webdriver_counter:
+            result['webdriver_calls'] = webdriver_counter['calls'] - calls_before
+        self.results[name] = result
+        return value
+
+
+def bench_http(bench):
+    from http_scraper import LinkedInHttpScraper
+    scraper = LinkedInHttpScraper()
+    try:
+        jobs = bench.measure('http_crawl', lambda: scraper.crawl([('software intern', 'Israel')]))
+        assert len(jobs) == 10, f"expected 10 jobs from fixtures, got {len(jobs)}"
+        bench.measure('http_crawl_empty', lambda: scraper.crawl([('nomatch', 'Israel')]))
+    finally:
+        scraper.close()
+
+    from enrichment import enrich_jobs
+    enriched = bench.measure('http_enrich', lambda: enrich_jobs(jobs))
+    assert all(job.get('description') for job in enriched), "job details were not parsed"
+
+
+def bench_parallel(bench):
+    from http_scraper import LinkedInHttpScraper
+    from worker_pool import crawl_parallel
+    # Every fixture search returns the same 10 jobs, so the merged result dedupes to 10
+    work_items = [(keyword, 'Israel') for keyword in ('software intern', 'software engineer', 'data intern', 'nomatch')]
+    for backend in ('thread', 'process'):
+        scraper = LinkedInHttpScraper()
+        try:
+            jobs = bench.measure(f'parallel_crawl_{backend}',
+                                 lambda: crawl_parallel(scraper, work_items, num_workers=3, backend=backend))
+            counters = scraper.metrics.counters
+            assert len(jobs) == 10, f"{backend}: expected 10 merged jobs, got {len(jobs)}"
+            assert counters['jobs_found'] == 30, f"{backend}: expected 30 jobs found, got {counters['jobs_found']}"
+            assert len(scraper.query_results) == len(work_items), \
+                f"{backend}: expected {len(work_items)} search results, got {len(scraper.query_results)}"
+            searches = sum(entry['count'] for (name, _), entry in scraper.metrics.spans.items() if name == 'search')
+            assert searches == len(work_items), f"{backend}: expected {len(work_items)} search spans, got {searches}"
+        finally:
+            scraper.close()
+
+
+def bench_selenium(bench):
+    from linkedin_scraper import LinkedInScraper
+    from metrics import count_webdriver_calls
+    try:
+        scraper = bench.measure('selenium_startup', LinkedInScraper)
+    except Exception as e:
+        bench.results.pop('selenium_startup', None)
+        print(f"Skipping Selenium stages, Chrome is not available: {str(e).splitlines()[0]}")
+        return
+    try:
+        counter = count_webdriver_calls(scraper.driver)
+        assert bench.measure('selenium_login', scraper.login, counter), "login against fixtures failed"
+        assert bench.measure('selenium_search', lambda: scraper.load_results_page('software intern', 'Israel'), counter)
+        jobs = bench.measure('selenium_extract', scraper.extract_job_data, counter)
+        assert len(jobs) == 25, f"expected 25 jobs from fixtures, got {len(jobs)}"
+        bench.measure('selenium_search_empty', lambda: scraper.load_results_page('nomatch', 'Israel'), counter)
+        bench.measure('selenium_crawl', lambda: scraper.crawl([('software intern', 'Israel')]), counter)
+    finally:
+        scraper.close()
+
+
+def bench_storage(bench, sizes):
+    from job_store import JobStore
+    for size in sizes:
+        path = os.path.join(os.getcwd(), f'jobs-{size}.db')
+        store = JobStore(path, seed_excel=None)
+        try:
+            bench.measure(f'storage_load_{size}', lambda: store.upsert(synthetic_jobs(size), '2026-10-01 09:00:00'))
+            bench.measure(f'storage_known_ids_{size}', store.known_ids)
+            # A typical run: 200 scraped jobs, half of them already stored
+            run_jobs = list(synthetic_jobs(200, offset=size - 100))
+            new_jobs = bench.measure(
+                f'storage_run_upsert_{size}', lambda: store.upsert(run_jobs, '2026-10-02 09:00:00')
+            )
+            assert len(new_jobs) == 100, f"expected 100 new jobs, got {len(new_jobs)}"
+            bench.measure(f'storage_export_{size}', lambda: store.export_excel(f'export-{size}.xlsx'))
+        finally:
+            store.close()
+            os.remove(path)
+
+
+def bench_sheets(bench):
+    import sqlite3
+    from sheets_sink import SheetsSink, MemoryWorksheet
+    conn = sqlite3.connect(os.path.join(os.getcwd(), 'sheets.db'))
+    try:
+        worksheet = MemoryWorksheet()
+        history = list(synthetic_jobs(10000))
+        # The first write reads the (empty) sheet once; later runs only append
+        bench.measure('sheets_first_write', lambda: SheetsSink(conn, worksheet).write(history, '2026-10-01 09:00:00'))
+        worksheet.calls.clear()
+        run_jobs = list(synthetic_jobs(200, offset=9900))
+        written = bench.measure('sheets_run_write', lambda: SheetsSink(conn, worksheet).write(run_jobs, '2026-10-02 09:00:00'))
+        assert written == 100, f"expected 100 new rows, got {written}"
+        assert worksheet.calls == ['append_rows'], f"expected one append call, got {worksheet.calls}"
+    finally:
+        conn.close()
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regressions against the baseline.
+
+    A measured stage without a baseline entry is reported too, since
+    nothing would check its latency or WebDriver round trips.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            regressions.append(f"{name}: no baseline entry (record one with --update-baseline)")
+            continue
+        expected = baseline[name]
+        # Entries without timings only pin the machine-independent WebDriver round trips
+        if 'seconds' in expected:
+            limit = expected['seconds'] * (1 + tolerance)
+            if result['seconds'] > limit and result['seconds'] - expected['seconds'] > 0.05:
+                regressions.append(f"{name}: {result['seconds']:.3f}s > {limit:.3f}s "
+                                   f"(baseline {expected['seconds']:.3f}s)")
+        if 'webdriver_calls' in expected and \
+                result.get('webdriver_calls', 0) > expected['webdriver_calls'] + WEBDRIVER_CALL_SLACK:
+            regressions.append(f"{name}: {result['webdriver_calls']} WebDriver calls "
+                               f"> baseline {expected['webdriver_calls']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run offline benchmarks against recorded LinkedIn pages.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='synthetic job history sizes for the storage stages')
+    parser.add_argument('--stages', nargs='+', default=['http', 'parallel', 'selenium', 'storage', 'sheets'],
+                        choices=['http', 'parallel', 'selenium', 'storage', 'sheets'])
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='allowed slowdown relative to the baseline (0.5 = 50%%)')
+    parser.add_argument('--update-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    server, base_url = start_server()
+    os.environ['LINKEDIN_BASE_URL'] = base_url
+    os.environ.setdefault('LINKEDIN_EMAIL', 'bench@example.com')
+    os.environ.setdefault('LINKEDIN_PASSWORD', 'bench')
+    # Measure the scraper itself, not the request pacing
+    os.environ.setdefault('RATE_LIMIT_PER_SECOND', '0')
+    # Pool workers build their sessions with create_scraper()
+    os.environ.setdefault('SCRAPER_BACKEND', 'http')
+
+    # Run in a scratch directory so the repository's data/ is untouched
+    workdir = tempfile.mkdtemp(prefix='linkedin-bench-')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    bench = Bench()
+    try:
+        if 'http' in args.stages:
+            bench_http(bench)
+        if 'parallel' in args.stages:
+            bench_parallel(bench)
+        if 'selenium' in args.stages:
+            bench_selenium(bench)
+        if 'storage' in args.stages:
+            bench_storage(bench, args.sizes)
+        if 'sheets' in args.stages:
+            bench_sheets(bench)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+        server.shutdown()
+
+    print(f"\n{'stage':32} {'seconds':>10} {'+RSS MB':>10} {'WD calls':>10}")
+    for name, result in sorted(bench.results.items()):
+        print(f"{name:32} {result['seconds']:>10.3f} {result['peak_mb']:>10.2f} "
+              f"{result.get('webdriver_calls', ''):>10}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(bench.results, f, indent=2, sort_keys=True)
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        baseline.update(bench.results)
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nUpdated {BASELINE_FILE}")
+        return 0
+
+    regressions = compare(bench.results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
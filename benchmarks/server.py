@@ -0,0 +1,71 @@
+"""Local stand-in for LinkedIn that serves the recorded page fixtures."""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Routes LinkedIn URLs to fixtures.
+
+    The first results page (start=0) returns the recorded results and later
+    pages return the empty-results page. Keywords containing 'nomatch' always
+    get the empty page.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        start = int(query.get('start', ['0'])[0])
+        keywords = query.get('keywords', [''])[0]
+
+        if url.path.startswith('/login'):
+            body = load_fixture('login.html')
+        elif url.path.startswith('/feed'):
+            body = load_fixture('feed.html')
+        elif url.path.startswith('/jobs-guest/jobs/api/jobPosting/'):
+            body = load_fixture('job_detail.html')
+        elif url.path.startswith('/jobs-guest/'):
+            body = b'' if start > 0 or 'nomatch' in keywords else load_fixture('guest_results.html')
+        elif url.path.startswith('/jobs/search'):
+            if start > 0 or 'nomatch' in keywords:
+                body = load_fixture('search_empty.html')
+            else:
+                body = load_fixture('search_results.html')
+        elif url.path in ('', '/'):
+            body = b'<html><body></body></html>'
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host='127.0.0.1', port=0):
+    """Start the fixture server in a background thread. Returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+if __name__ == '__main__':
+    server, base_url = start_server(port=8765)
+    print(f"Serving LinkedIn fixtures at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
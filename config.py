@@ -1,8 +1,11 @@
 import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables from a .env file, importing python-dotenv only when there is one
+_ENV_FILES = [os.path.join(os.getcwd(), '.env'), os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')]
+_ENV_FILE = next((path for path in _ENV_FILES if os.path.exists(path)), None)
+if _ENV_FILE:
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_FILE)
 
 # LinkedIn credentials
 LINKEDIN_EMAIL = os.getenv('LINKEDIN_EMAIL', 'your-email@example.com')
@@ -26,16 +29,174 @@ JOB_KEYWORDS = [
     "computer science internship"
 ]
 
+# A single location string, or a list of locations to fan out over.
+# A bare number is used as a LinkedIn geoId instead of a location name.
 LOCATION = "Israel"
+LOCATIONS = LOCATION if isinstance(LOCATION, list) else [LOCATION]
+
+# Search facets: every combination of the listed values is searched for each
+# keyword and location; an empty list leaves that filter off.
+#   f_E  experience: 1 internship, 2 entry level, 3 associate, 4 mid-senior, 5 director, 6 executive
+#   f_JT job type: F full-time, P part-time, C contract, T temporary, I internship, V volunteer, O other
+#   f_WT workplace: 1 on-site, 2 remote, 3 hybrid
+SEARCH_FACETS = {
+    'f_E': [],
+    'f_JT': [],
+    'f_WT': []
+}
+# f_TPR only expresses "posted in the last N seconds" (r86400 = day, r604800 = week)
+SEARCH_TIME_RANGE = os.getenv('SEARCH_TIME_RANGE', 'r1209600')
+# Newest first: paging stops at the first page with nothing new, which is
+# only safe when later pages hold older postings
+SEARCH_SORT = 'DD'
+# Searches reporting more results than MAX_RESULTS are split on these facets,
+# one per level, until every slice fits. Postings without a value for a facet
+# match none of its slices, so the facets LinkedIn requires on every posting
+# (job type, workplace) come first and the optional ones last
+SPLIT_FACETS = [
+    ('f_JT', ['F', 'P', 'C', 'T', 'I', 'V', 'O']),
+    ('f_WT', ['1', '2', '3']),
+    ('f_E', ['1', '2', '3', '4', '5', '6']),
+    ('location', None)
+]
+SPLIT_LOCATIONS = {
+    'Israel': [
+        'Tel Aviv-Yafo, Israel', 'Jerusalem, Israel', 'Haifa, Israel', 'Herzliya, Israel',
+        'Petah Tikva, Israel', 'Ramat Gan, Israel', 'Ra\'anana, Israel', 'Netanya, Israel',
+        'Rehovot, Israel', 'Be\'er Sheva, Israel', 'Kfar Saba, Israel', 'Hod Hasharon, Israel'
+    ]
+}
+
+# Base URL for all LinkedIn requests (point at a local server for offline runs)
+LINKEDIN_BASE_URL = os.getenv('LINKEDIN_BASE_URL', 'https://www.linkedin.com')
+
+# Scraping backend: 'selenium' drives Chrome, 'http' fetches the public
+# job-search fragments and falls back to Selenium on an auth wall
+SCRAPER_BACKEND = os.getenv('SCRAPER_BACKEND', 'selenium')
+HTTP_TIMEOUT = 15
+HTTP_POOL_SIZE = 10
+
+# Fetch detail pages (posted date, applicants, description) for new jobs
+ENRICH_DETAILS = os.getenv('ENRICH_DETAILS', '1') == '1'
+ENRICH_CONCURRENCY = 4
+
+# LinkedIn never returns more than this many results for one search
+MAX_RESULTS = 1000
+
+# Query planner: searches whose results were almost entirely returned by
+# higher-yield searches, or that found nothing new lately, only run every
+# PLANNER_RECHECK_EVERY runs once they have PLANNER_MIN_RUNS of history
+QUERY_PLANNER = os.getenv('QUERY_PLANNER', '1') == '1'
+PLANNER_WINDOW = 5
+PLANNER_MIN_RUNS = 3
+PLANNER_REDUNDANT_COVERAGE = 0.9
+PLANNER_RECHECK_EVERY = int(os.getenv('PLANNER_RECHECK_EVERY', '4'))
+# Stop starting new searches after this many seconds (0 = no limit)
+RUN_TIME_BUDGET = int(os.getenv('RUN_TIME_BUDGET', '0'))
+
+# Near-duplicate detection: MinHash signatures over title/company/description
+# shingles, bucketed with LSH; reposts at or above the threshold share a cluster
+NEAR_DUPLICATES = os.getenv('NEAR_DUPLICATES', '1') == '1'
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+NEAR_DUPLICATE_THRESHOLD = 0.8
+# Titles on their own must also be this similar (character 4-gram Jaccard)
+NEAR_DUPLICATE_TITLE_THRESHOLD = 0.7
+DESCRIPTION_SHINGLE_WORDS = 300
+
+# Request pacing shared by all page loads and HTTP fetches (0 = unpaced).
+# Throttling (429s, authwall/checkpoint redirects, EMPTY_PAGES_BEFORE_BACKOFF
+# empty first pages in a row) triggers a jittered exponential backoff
+RATE_LIMIT_PER_SECOND = float(os.getenv('RATE_LIMIT_PER_SECOND', '1'))
+RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '5'))
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 300
+RATE_MAX_RETRIES = 3
+RATE_RECOVERY_SUCCESSES = 5
+EMPTY_PAGES_BEFORE_BACKOFF = 3
+
+# Browser settings. The lean profile runs headless, skips images, media,
+# fonts and ad/tracking hosts, and uses the 'eager' page load strategy.
+LEAN_DRIVER = os.getenv('LEAN_DRIVER', '1') == '1'
+HEADLESS = os.getenv('HEADLESS', '1') == '1'
+WINDOW_SIZE = os.getenv('WINDOW_SIZE', '1366,900')
+# Pinned chromedriver binary; when unset the path resolved by
+# webdriver-manager is cached so later runs skip its network check
+CHROMEDRIVER_PATH = os.getenv('CHROMEDRIVER_PATH')
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3',
+    '*doubleclick.net*', '*googletagmanager.com*', '*google-analytics.com*',
+    '*px.ads.linkedin.com*', '*snap.licdn.com*'
+]
+
+# Worker pool settings
+NUM_WORKERS = int(os.getenv('NUM_WORKERS', '1'))
+WORKER_BACKEND = os.getenv('WORKER_BACKEND', 'thread')  # 'thread' or 'process'
 
 # File paths
 DATA_DIR = 'data'
 LOGS_DIR = 'logs'
 EXCEL_FILE = "linkedin_jobs.xlsx"
+JOBS_DB = os.path.join(DATA_DIR, 'jobs.db')
+SHARDS_DIR = os.path.join(DATA_DIR, 'shards')
+SNAPSHOTS_DIR = os.path.join(DATA_DIR, 'snapshots')
+# Query planner history, kept outside jobs.db so it survives a database
+# rebuilt from shards (the GitHub Actions workflow commits data/)
+PLANNER_HISTORY_FILE = os.path.join(DATA_DIR, 'query_history.json')
+# Write-ahead journal of the running scrape, replayed if the run is interrupted
+JOURNAL_DIR = os.path.join(DATA_DIR, 'journal')
+# Older journals are replayed into storage but their searches start over
+JOURNAL_MAX_AGE_HOURS = int(os.getenv('JOURNAL_MAX_AGE_HOURS', '24'))
+
+# Per-run metrics: a JSON summary per run plus a Prometheus textfile
+METRICS_DIR = os.path.join(DATA_DIR, 'metrics')
+PROMETHEUS_TEXTFILE = os.path.join(METRICS_DIR, 'linkedin_scraper.prom')
+
+# Saved login cookies, reused between runs until they expire
+SESSION_FILE = os.path.join(DATA_DIR, 'session.json')
+# Optional Chrome profile directory that keeps the whole browser session;
+# only the primary session uses it, pool workers start from its cookies
+CHROME_USER_DATA_DIR = os.getenv('CHROME_USER_DATA_DIR')
+CHROMEDRIVER_CACHE_FILE = os.path.join(DATA_DIR, 'chromedriver_path.txt')
+
+# Output mode: 'excel' rewrites the xlsx every run, 'shards' writes one
+# small JSONL delta per run and only derives the xlsx on compaction
+OUTPUT_MODE = os.getenv('OUTPUT_MODE', 'excel')
+
+# Google Sheets output: each run appends its new jobs in one batched call
+SHEETS_OUTPUT = os.getenv('SHEETS_OUTPUT', '0') == '1'
+GOOGLE_SHEET_URL = os.getenv(
+    'GOOGLE_SHEET_URL',
+    'https://docs.google.com/spreadsheets/d/17MUOxp8GwaJMA1YYpQkNulNavZlnmRQwh4K3TyAhXvM/edit?usp=sharing'
+)
+GOOGLE_CREDENTIALS_FILE = os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials.json')
+SHEETS_WORKSHEET_INDEX = 0
 
 # Email settings
 EMAIL_SUBJECT = 'New LinkedIn Jobs in Israel'
 EMAIL_BODY = 'New job listings have been found and added to the Excel file.'
 
 # Time settings
-MAX_DAYS_OLD = 30 
\ No newline at end of file
+MAX_DAYS_OLD = 30
+
+# Per-step timeouts (seconds) for readiness waits
+WAIT_TIMEOUTS = {
+    'login_form': 20,
+    'login_complete': 30,
+    'post_login_idle': 10,
+    'session_probe': 10,
+    'results': 15,
+    'scroll': 3
+}
+
+# Daemon settings
+SCHEDULE_EVERY_DAYS = int(os.getenv('SCHEDULE_EVERY_DAYS', '2'))
+SCHEDULE_AT = os.getenv('SCHEDULE_AT', '09:00')
+# Recycle the warm browser after this many result pages or above this RSS
+RECYCLE_AFTER_PAGES = int(os.getenv('RECYCLE_AFTER_PAGES', '300'))
+RECYCLE_RSS_MB = int(os.getenv('RECYCLE_RSS_MB', '1500'))
+# Touch this file (or send SIGUSR1) to trigger a run between scheduled ones
+TRIGGER_FILE = os.path.join(DATA_DIR, 'run.trigger')
+TRIGGER_POLL_SECONDS = 5 
\ No newline at end of file
@@ -0,0 +1,108 @@
+import os
+import signal
+import time
+import logging
+import schedule
+from linkedin_scraper import create_scraper
+from config import (
+    SCHEDULE_EVERY_DAYS, SCHEDULE_AT, RECYCLE_AFTER_PAGES,
+    RECYCLE_RSS_MB, TRIGGER_FILE, TRIGGER_POLL_SECONDS
+)
+
+
+class ScraperDaemon:
+    """Keeps a warm, health-checked scraper alive between scheduled runs."""
+
+    def __init__(self, recycle_after_pages=RECYCLE_AFTER_PAGES, recycle_rss_mb=RECYCLE_RSS_MB,
+                 trigger_file=TRIGGER_FILE):
+        self.recycle_after_pages = recycle_after_pages
+        self.recycle_rss_mb = recycle_rss_mb
+        self.trigger_file = trigger_file
+        self.scraper = None
+        self.trigger_requested = False
+
+    def recycle_reason(self):
+        """Return why the current browser should be replaced, or None to keep it."""
+        if not self.scraper.is_healthy():
+            return "browser is not responding"
+        if self.scraper.pages_loaded >= self.recycle_after_pages:
+            return f"loaded {self.scraper.pages_loaded} pages"
+        rss = self.scraper.browser_rss_mb()
+        if rss is not None and rss >= self.recycle_rss_mb:
+            return f"using {rss:.0f} MB"
+        return None
+
+    def get_scraper(self):
+        """Return the warm scraper, recycling or starting it as needed."""
+        if self.scraper is not None:
+            reason = self.recycle_reason()
+            if reason is None:
+                return self.scraper
+            print(f"Recycling browser: {reason}")
+            logging.info(f"Recycling browser: {reason}")
+            self.close()
+        self.scraper = create_scraper()
+        return self.scraper
+
+    def run_once(self):
+        """Run one scrape on the warm browser."""
+        try:
+            print("Starting job scraping process...")
+            success = self.get_scraper().scrape(close=False)
+            if success:
+                print("Job scraping completed successfully")
+                logging.info("Job scraping completed successfully")
+            else:
+                print("Job scraping failed. Check logs for details.")
+                logging.error("Job scraping failed")
+            return success
+        except Exception as e:
+            print(f"Error during job scraping: {str(e)}")
+            logging.error(f"Error during job scraping: {str(e)}")
+            self.close()
+            return False
+
+    def request_run(self, *args):
+        """Ask for a run at the next poll (used as the SIGUSR1 handler)."""
+        self.trigger_requested = True
+
+    def consume_trigger(self):
+        """Return True once if a run was requested by signal or trigger file."""
+        triggered = self.trigger_requested
+        self.trigger_requested = False
+        if os.path.exists(self.trigger_file):
+            os.remove(self.trigger_file)
+            triggered = True
+        return triggered
+
+    def run_forever(self, run_immediately=True):
+        """Run on the schedule and on demand until interrupted."""
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self.request_run)
+
+        if run_immediately:
+            self.run_once()
+
+        schedule.every(SCHEDULE_EVERY_DAYS).days.at(SCHEDULE_AT).do(self.run_once)
+        print(f"Scheduler started. Will run every {SCHEDULE_EVERY_DAYS} days at {SCHEDULE_AT}.")
+        print(f"Touch {self.trigger_file} or send SIGUSR1 to pid {os.getpid()} to run now.")
+        logging.info(f"Scheduler started. Will run every {SCHEDULE_EVERY_DAYS} days at {SCHEDULE_AT}.")
+
+        try:
+            while True:
+                schedule.run_pending()
+                if self.consume_trigger():
+                    print("Run triggered")
+                    self.run_once()
+                time.sleep(TRIGGER_POLL_SECONDS)
+        finally:
+            self.close()
+
+    def close(self):
+        """Shut down the warm browser."""
+        if self.scraper is not None:
+            try:
+                self.scraper.close()
+            except Exception as e:
+                logging.warning(f"Failed to close scraper: {str(e)}")
+            self.scraper = None
@@ -0,0 +1,145 @@
+import re
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from bs4 import BeautifulSoup
+from config import LINKEDIN_BASE_URL, MAX_DAYS_OLD, HTTP_TIMEOUT, ENRICH_CONCURRENCY
+
+DETAIL_PATH = '/jobs-guest/jobs/api/jobPosting/{job_id}'
+
+AGE_PATTERN = re.compile(r'(\d+)\s*(second|minute|hour|day|week|month|year)s?', re.IGNORECASE)
+AGE_UNITS = {
+    'second': timedelta(seconds=1),
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+    'month': timedelta(days=30),
+    'year': timedelta(days=365)
+}
+
+
+def parse_posting_date(date_text, now=None):
+    """Parse text like '3 days ago' or an ISO date into a datetime.
+
+    Unrecognised text is treated as posted ``now``.
+    """
+    now = now or datetime.now()
+    if not date_text:
+        return now
+    try:
+        return datetime.strptime(date_text.strip()[:10], '%Y-%m-%d')
+    except ValueError:
+        pass
+    match = AGE_PATTERN.search(date_text)
+    if not match:
+        return now
+    return now - int(match.group(1)) * AGE_UNITS[match.group(2).lower()]
+
+
+def parse_posting_dates(date_texts, now=None):
+    """Parse a batch of posting dates against one reference time."""
+    now = now or datetime.now()
+    return [parse_posting_date(text, now) for text in date_texts]
+
+
+def parse_applicants(text):
+    """Return the applicant count from text like 'Over 200 applicants'."""
+    match = re.search(r'([\d,]+)\s+applicant', text or '')
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+def parse_job_detail(html):
+    """Parse a public job-posting page into a dict of detail fields."""
+    from http_scraper import HTML_PARSER
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    def text(selector):
+        element = soup.select_one(selector)
+        return element.get_text(' ', strip=True) if element else None
+
+    criteria = {}
+    for item in soup.select('.description__job-criteria-item'):
+        name = item.select_one('.description__job-criteria-subheader')
+        value = item.select_one('.description__job-criteria-text')
+        if name and value:
+            criteria[name.get_text(strip=True).lower()] = value.get_text(strip=True)
+
+    posted = soup.select_one('.posted-time-ago__text')
+    applicants = soup.select_one('.num-applicants__caption, .num-applicants__figure')
+    return {
+        'posted_text': posted.get_text(strip=True) if posted else None,
+        'company': text('a.topcard__org-name-link') or text('.topcard__flavor'),
+        'location': text('.topcard__flavor--bullet'),
+        'applicants': parse_applicants(applicants.get_text(' ', strip=True)) if applicants else None,
+        'seniority': criteria.get('seniority level'),
+        'employment_type': criteria.get('employment type'),
+        'description': text('.show-more-less-html__markup, .description__text')
+    }
+
+
+def fetch_job_detail(session, job_id, metrics=None):
+    """Fetch and parse one job's detail page. Returns None on failure."""
+    from rate_control import rate_controller
+    url = f'{LINKEDIN_BASE_URL}{DETAIL_PATH.format(job_id=job_id)}'
+    try:
+        response = rate_controller().get(session, url, metrics, timeout=HTTP_TIMEOUT)
+        if response.status_code != 200 or not response.text.strip():
+            logging.warning(f"Job detail {job_id} returned {response.status_code}")
+            return None
+        return parse_job_detail(response.text)
+    except Exception as e:
+        logging.warning(f"Failed to fetch job detail {job_id}: {str(e)}")
+        return None
+
+
+def enrich_jobs(jobs, session=None, concurrency=ENRICH_CONCURRENCY, max_days_old=MAX_DAYS_OLD, metrics=None):
+    """Add detail fields to jobs and drop the ones older than ``max_days_old``.
+
+    Detail pages are fetched concurrently over one pooled session. Jobs whose
+    detail page cannot be fetched are kept with their search-card fields.
+    """
+    if not jobs:
+        return []
+    owns_session = session is None
+    if owns_session:
+        from http_scraper import create_session
+        session = create_session(pool_size=concurrency)
+
+    now = datetime.now()
+    cutoff = now - timedelta(days=max_days_old)
+
+    # Drop what the search cards already show to be stale before fetching anything
+    candidates = [job for job, posted in zip(jobs, parse_posting_dates([j.get('listed_time') for j in jobs], now))
+                  if not job.get('listed_time') or posted >= cutoff]
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            details = list(executor.map(lambda job: fetch_job_detail(session, job['job_id'], metrics), candidates))
+    finally:
+        if owns_session:
+            session.close()
+
+    enriched = []
+    for job, detail in zip(candidates, details):
+        if detail:
+            posted_text = detail.pop('posted_text')
+            job.update({key: value for key, value in detail.items() if value is not None})
+            if posted_text:
+                job['posted_at'] = parse_posting_date(posted_text, now).strftime('%Y-%m-%d')
+        posted_at = job.get('posted_at') or job.get('listed_time')
+        if posted_at and parse_posting_date(posted_at, now) < cutoff:
+            continue
+        enriched.append(job)
+
+    dropped = len(jobs) - len(enriched)
+    fetched = sum(1 for detail in details if detail)
+    print(f"Enriched {fetched}/{len(candidates)} new jobs in {time.perf_counter() - start:.2f}s, "
+          f"dropped {dropped} older than {max_days_old} days")
+    if metrics:
+        metrics.record('enrich', time.perf_counter() - start)
+        metrics.incr('enriched', fetched)
+        metrics.incr('stale_dropped', dropped)
+    return enriched
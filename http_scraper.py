@@ -0,0 +1,235 @@
+import time
+import logging
+from urllib.parse import urlencode
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+from linkedin_scraper import LinkedInScraper
+from job_store import job_key
+from rate_control import rate_controller
+from search_facets import search_params, scope_label
+from config import LINKEDIN_BASE_URL, LOCATIONS, HTTP_TIMEOUT, HTTP_POOL_SIZE
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+SEARCH_PATH = '/jobs-guest/jobs/api/seeMoreJobPostings/search'
+USER_AGENT = (
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+
+
+def create_session(pool_size=HTTP_POOL_SIZE):
+    """Create a requests session with keep-alive connection pooling."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'})
+    return session
+
+
+def is_auth_wall(response):
+    """Return True if LinkedIn refused the request and wants a logged-in session."""
+    url = response.url.lower()
+    return (
+        response.status_code in (401, 403, 999) or
+        'authwall' in url or
+        '/login' in url or
+        'checkpoint' in url
+    )
+
+
+def parse_job_cards(html):
+    """Parse job cards from a public job-search result fragment."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    jobs = []
+    for card in soup.select('div.base-card, div.job-search-card'):
+        link_element = card.select_one('a.base-card__full-link') or card.find('a', href=True)
+        title_element = card.select_one('.base-search-card__title')
+        if not link_element or not title_element:
+            continue
+        link = link_element['href']
+        company = card.select_one('.base-search-card__subtitle')
+        location = card.select_one('.job-search-card__location')
+        listed = card.select_one('time')
+        urn = card.get('data-entity-urn') or ''
+        jobs.append({
+            'title': title_element.get_text(strip=True),
+            'link': link,
+            'company': company.get_text(strip=True) if company else None,
+            'location': location.get_text(strip=True) if location else None,
+            'listed_time': (listed.get('datetime') or listed.get_text(strip=True)) if listed else None,
+            'job_id': urn.rsplit(':', 1)[-1] if urn else job_key(link)
+        })
+    return jobs
+
+
+class LinkedInHttpScraper(LinkedInScraper):
+    """Scraper backend that fetches public search fragments over HTTP.
+
+    Exposes the same ``search_jobs``/``extract_job_data`` interface as
+    ``LinkedInScraper``. When LinkedIn answers with an auth wall, the rest of
+    the run is handed to a logged-in Selenium scraper.
+    """
+    page_size = 10
+
+    def setup_driver(self):
+        """Set up the pooled HTTP session instead of a browser."""
+        self.session = create_session()
+        self.fallback = None
+        self.use_fallback = False
+        self.fallback_failed = False
+        self.fallback_start = 0
+        self.last_response = None
+
+    def login(self):
+        """The public search endpoint needs no login."""
+        return True
+
+    def ensure_logged_in(self):
+        """No session to restore or save; the Selenium fallback handles its own."""
+        return True
+
+    def get_session_state(self):
+        """Return the HTTP session cookies in WebDriver cookie format."""
+        return [{'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path}
+                for c in self.session.cookies]
+
+    def apply_session_state(self, cookies):
+        """Load cookies into the HTTP session."""
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        return True
+
+    def is_healthy(self):
+        """The HTTP session has no process to go stale."""
+        return True
+
+    def browser_rss_mb(self):
+        """Report the Selenium fallback's memory, if one is running."""
+        return self.fallback.browser_rss_mb() if self.fallback else None
+
+    def get_fallback(self):
+        """Return a logged-in Selenium scraper, creating it on first use.
+
+        A failed start or login is remembered, so the rest of the run does
+        not start a browser and log in again for every search.
+        """
+        if self.fallback is None and not self.fallback_failed:
+            print("Starting Selenium fallback...")
+            try:
+                self.fallback = LinkedInScraper(self.primary)
+                # Report the fallback's page loads and waits in this run's metrics
+                self.metrics.merge(self.fallback.metrics.snapshot())
+                self.fallback.metrics = self.metrics
+                if not self.fallback.ensure_logged_in():
+                    print("Selenium fallback failed to login")
+                    logging.error("Selenium fallback failed to login, not retrying this run")
+                    self.fallback.close()
+                    self.fallback = None
+                    self.fallback_failed = True
+            except Exception as e:
+                print(f"Failed to start Selenium fallback: {str(e)}")
+                logging.error(f"Failed to start Selenium fallback: {str(e)}")
+                if self.fallback:
+                    self.fallback.close()
+                self.fallback = None
+                self.fallback_failed = True
+        return self.fallback
+
+    def scrape(self, close=True):
+        """Run a scrape, trying the HTTP endpoint first again.
+
+        An auth wall or a failed fallback login only lasts for one run, so a
+        daemon reusing this scraper does not stay stuck on a past failure.
+        """
+        self.use_fallback = False
+        self.fallback_failed = False
+        return super().scrape(close)
+
+    def search_jobs(self, keyword, location=None, known_ids=None, start=0, split=True):
+        """Search for jobs over HTTP, switching to Selenium after an auth wall."""
+        # An auth wall moves this to the offset it interrupted
+        self.fallback_start = start
+        self.search_loaded = False
+        if not self.use_fallback:
+            yield from super().search_jobs(keyword, location, known_ids, start, split)
+        if self.use_fallback:
+            fallback = self.get_fallback()
+            if fallback:
+                fallback.journal = self.journal
+                # Each run starts fresh metrics, so point a reused fallback at the current ones
+                fallback.metrics = self.metrics
+                yield from fallback.search_jobs(keyword, location, known_ids, self.fallback_start, split)
+                self.over_cap, self.split_offset = fallback.over_cap, fallback.split_offset
+                self.search_loaded = self.search_loaded or fallback.search_loaded
+
+    def load_results_page(self, keyword, location=None, start=0):
+        """Fetch the result fragment starting at offset ``start``."""
+        self.page_answered = False
+        try:
+            location = location or LOCATIONS[0]
+            # The guest fragment reports no result count, so over-cap searches are found by paging to the cap
+            params = dict({'keywords': keyword}, **search_params(location), start=start)
+            search_url = f'{LINKEDIN_BASE_URL}{SEARCH_PATH}?{urlencode(params)}'
+            print(f"\nSearching for jobs with keyword: {keyword} in {scope_label(location)} (start={start})")
+            print(f"Search URL: {search_url}")
+
+            self.last_response = None
+            response = rate_controller().get(self.session, search_url, self.metrics, timeout=HTTP_TIMEOUT)
+
+            if is_auth_wall(response):
+                print(f"Hit auth wall ({response.status_code}), falling back to Selenium")
+                logging.warning(f"HTTP backend hit auth wall for {keyword}: {response.url}")
+                self.use_fallback = True
+                self.fallback_start = start
+                return False
+
+            # An empty 200 is the guest API's answer for no (more) results
+            self.page_answered = response.status_code == 200
+            if response.status_code != 200 or not response.text.strip():
+                print("No matching jobs found for this keyword, skipping to next search...")
+                if start == 0 and self.empty_page_is_suspicious(keyword, location):
+                    rate_controller().empty_page(self.metrics)
+                return False
+
+            self.last_response = response
+            return True
+
+        except Exception as e:
+            print(f"Job search failed: {str(e)}")
+            return False
+
+    def extract_job_data(self):
+        """Parse job cards from the last fetched fragment."""
+        jobs = []
+        timing = {'mode': 'http', 'scroll': 0.0, 'extract': 0.0, 'cards': 0}
+        self.last_extract_timing = timing
+        if self.last_response is None:
+            return jobs
+        try:
+            start = time.perf_counter()
+            jobs = parse_job_cards(self.last_response.text)
+            timing['extract'] = time.perf_counter() - start
+            timing['cards'] = len(jobs)
+            self.metrics.record('extract', timing['extract'])
+            print(f"Successfully extracted {len(jobs)} jobs (parse {timing['extract']:.3f}s)")
+            return jobs
+        except Exception as e:
+            print(f"Failed to extract job data: {str(e)}")
+            return jobs
+
+    def close(self):
+        """Close the HTTP session, any Selenium fallback and the job store."""
+        self.session.close()
+        if self.fallback:
+            self.fallback.close()
+        if self.store:
+            self.store.close()
+            self.store = None
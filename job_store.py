@@ -0,0 +1,163 @@
+import os
+import re
+import sqlite3
+from datetime import datetime
+from config import JOBS_DB, EXCEL_FILE
+
+# Job fields stored alongside the ID, in export order
+JOB_COLUMNS = [
+    'title', 'link', 'company', 'location', 'listed_time',
+    'posted_at', 'applicants', 'seniority', 'employment_type', 'description'
+]
+
+
+def job_key(link):
+    """Return a stable key for a job link (the numeric job ID when present)."""
+    match = re.search(r'/jobs/view/(?:[^/?]*-)?(\d+)', link or '') or \
+        re.search(r'currentJobId=(\d+)', link or '')
+    if match:
+        return match.group(1)
+    return (link or '').split('?')[0]
+
+
+def canonical_link(job_id, link):
+    """Return the job link without per-session tracking parameters."""
+    if job_id and job_id.isdigit():
+        return f'https://www.linkedin.com/jobs/view/{job_id}/'
+    return link
+
+
+class JobStore:
+    """SQLite-backed job index keyed by the numeric LinkedIn job ID."""
+
+    def __init__(self, path=JOBS_DB, seed_excel=EXCEL_FILE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        is_new = not os.path.exists(path)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                {', '.join(f'{column} TEXT' for column in JOB_COLUMNS)},
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                cluster_id TEXT
+            )
+        ''')
+        # Add columns introduced after the database was created
+        existing = {row[1] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+        for column in JOB_COLUMNS:
+            if column not in existing:
+                self.conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} TEXT')
+        if 'cluster_id' not in existing:
+            self.conn.execute('ALTER TABLE jobs ADD COLUMN cluster_id TEXT')
+            self.conn.execute('UPDATE jobs SET cluster_id = job_id')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS jobs_cluster ON jobs (cluster_id)')
+        self.conn.commit()
+        if is_new:
+            self.seed(seed_excel)
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def known_ids(self):
+        """Return every stored job ID as a set for constant-time membership checks."""
+        return {row[0] for row in self.conn.execute('SELECT job_id FROM jobs')}
+
+    def upsert(self, jobs, seen_at=None):
+        """Insert new jobs and refresh last_seen on known ones. Returns the new jobs."""
+        seen_at = seen_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        new_jobs = []
+        with self.conn:
+            for job in jobs:
+                job_id = job.get('job_id') or job_key(job.get('link'))
+                values = [job.get(column) for column in JOB_COLUMNS]
+                values[JOB_COLUMNS.index('link')] = canonical_link(job_id, job.get('link'))
+                cursor = self.conn.execute(
+                    f'''INSERT OR IGNORE INTO jobs (job_id, {', '.join(JOB_COLUMNS)}, first_seen, last_seen, cluster_id)
+                        VALUES ({', '.join('?' * (len(JOB_COLUMNS) + 4))})''',
+                    [job_id] + values + [seen_at, seen_at, job_id]
+                )
+                if cursor.rowcount:
+                    new_jobs.append(job)
+                else:
+                    # Keep existing values where the new sighting has none
+                    self.conn.execute(
+                        f'''UPDATE jobs SET last_seen = ?,
+                            {', '.join(f'{column} = COALESCE(?, {column})' for column in JOB_COLUMNS)}
+                            WHERE job_id = ?''',
+                        [seen_at] + values + [job_id]
+                    )
+        return new_jobs
+
+    def seed(self, excel_file=None):
+        """Fill a new store from the Excel file and any snapshot/shard files."""
+        from shards import iter_records
+        if excel_file and os.path.exists(excel_file):
+            self.import_excel(excel_file)
+        self.import_records(iter_records())
+
+    def import_records(self, records):
+        """Upsert records that carry their own first_seen timestamp."""
+        jobs_by_date = {}
+        for record in records:
+            jobs_by_date.setdefault(record.get('first_seen'), []).append(record)
+        for seen_at, jobs in sorted(jobs_by_date.items(), key=lambda item: item[0] or ''):
+            self.upsert(jobs, seen_at)
+
+    def import_excel(self, path):
+        """Seed the store from an existing Excel export."""
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell) for cell in next(rows, [])]
+        records = []
+        for row in rows:
+            record = dict(zip(header, row))
+            if not record.get('link'):
+                continue
+            record['first_seen'] = str(record.get('scraped_date') or record.get('last_seen') or '') or None
+            records.append(record)
+        workbook.close()
+        self.import_records(records)
+        print(f"Imported {len(self)} jobs from {path}")
+
+    def iter_canonical_jobs(self):
+        """Yield one job per near-duplicate cluster, with the cluster's last_seen and repost count."""
+        cursor = self.conn.execute(f'''
+            SELECT job_id, {", ".join(JOB_COLUMNS)}, first_seen,
+                (SELECT MAX(last_seen) FROM jobs m WHERE m.cluster_id = j.job_id) AS last_seen,
+                (SELECT COUNT(*) - 1 FROM jobs m WHERE m.cluster_id = j.job_id) AS reposts
+            FROM jobs j WHERE cluster_id = job_id ORDER BY first_seen, job_id
+        ''')
+        columns = [description[0] for description in cursor.description]
+        for row in cursor:
+            yield dict(zip(columns, row))
+
+    def export_excel(self, path=EXCEL_FILE):
+        """Write one row per job cluster to an Excel file using openpyxl's write-only mode."""
+        from openpyxl import Workbook
+        from openpyxl.utils import get_column_letter
+        header = ['job_id'] + JOB_COLUMNS + ['scraped_date', 'last_seen', 'reposts']
+        stored = ['job_id'] + JOB_COLUMNS + ['first_seen', 'last_seen', 'reposts']
+
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Jobs')
+        # Column widths come from one aggregate query instead of scanning every cell
+        lengths = self.conn.execute(
+            f'SELECT {", ".join(f"MAX(LENGTH({column}))" for column in stored[:-1])} FROM jobs'
+        ).fetchone() + (None,)
+        for idx, (name, length) in enumerate(zip(header, lengths), start=1):
+            worksheet.column_dimensions[get_column_letter(idx)].width = min(max(length or 0, len(name)) + 2, 100)
+
+        worksheet.append(header)
+        for job in self.iter_canonical_jobs():
+            worksheet.append([job[column] for column in stored])
+        workbook.save(path)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
@@ -2,75 +2,289 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import SessionNotCreatedException
 from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import time
+import json
 import logging
 import os
+from urllib.parse import urlencode
 from config import (
     LINKEDIN_EMAIL, LINKEDIN_PASSWORD, JOB_KEYWORDS,
-    LOCATION, MAX_DAYS_OLD, EXCEL_FILE
+    LOCATIONS, MAX_DAYS_OLD, EXCEL_FILE,
+    LINKEDIN_BASE_URL, NUM_WORKERS, SCRAPER_BACKEND, MAX_RESULTS,
+    OUTPUT_MODE, SHARDS_DIR, SESSION_FILE, CHROME_USER_DATA_DIR,
+    LEAN_DRIVER, HEADLESS, WINDOW_SIZE, CHROMEDRIVER_PATH,
+    CHROMEDRIVER_CACHE_FILE, BLOCKED_URL_PATTERNS, WAIT_TIMEOUTS, ENRICH_DETAILS,
+    QUERY_PLANNER, RUN_TIME_BUDGET, NEAR_DUPLICATES, SHEETS_OUTPUT,
+    GOOGLE_SHEET_URL, GOOGLE_CREDENTIALS_FILE
 )
-
-# Set up logging
-logging.basicConfig(
-    filename='logs/scraper.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+from job_store import JobStore, job_key
+from run_journal import RunJournal
+from rate_control import rate_controller
+from search_facets import (
+    search_params, search_scopes, split_scope, scope_label, scope_root, is_base_location, parse_result_count
+)
+from metrics import Metrics, count_webdriver_calls
+from enrichment import parse_posting_date
+from waits import (
+    WaitRecorder, element_present, text_present,
+    any_of, element_count_stable, network_idle
 )
 
+# Bytes transferred for the current page, as reported by the Resource Timing API,
+# and the result count LinkedIn shows above the list, in one round trip
+PAGE_INFO_SCRIPT = """
+const bytes = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .reduce((total, entry) => total + (entry.transferSize || 0), 0);
+const count = document.querySelector(arguments[0]);
+return [bytes, count ? count.textContent : null];
+"""
+RESULT_COUNT_SELECTOR = '.jobs-search-results-list__subtitle, .results-context-header__job-count'
+
+# Selectors for the scrollable results list on the search page
+NO_RESULTS_SELECTOR = 'h1.t-24.t-black.t-normal.text-align-center'
+RESULTS_LIST_SELECTOR = '.jobs-search-results-list, .scaffold-layout__list > div'
+JOB_LINK_SELECTOR = 'a.job-card-list__title--link'
+
+# Scrolls the results list to the bottom and returns how many cards are loaded
+SCROLL_RESULTS_SCRIPT = """
+const list = document.querySelector(arguments[0]);
+if (list) { list.scrollTop = list.scrollHeight; } else { window.scrollTo(0, document.body.scrollHeight); }
+return document.querySelectorAll(arguments[1]).length;
+"""
+
+# Pulls every job card's fields in a single round trip
+EXTRACT_CARDS_SCRIPT = """
+const text = (root, selector) => {
+    const el = root ? root.querySelector(selector) : null;
+    return el ? el.textContent.trim().replace(/\\s+/g, ' ') : null;
+};
+return JSON.stringify(Array.from(document.querySelectorAll(arguments[0])).map(a => {
+    const card = a.closest('[data-job-id]') || a.closest('li') || a.parentElement;
+    const time = card ? card.querySelector('time') : null;
+    return {
+        title: a.getAttribute('aria-label') || a.textContent.trim(),
+        link: a.href,
+        company: text(card, '.job-card-container__primary-description, .artdeco-entity-lockup__subtitle'),
+        location: text(card, '.job-card-container__metadata-item, .artdeco-entity-lockup__caption'),
+        listed_time: time ? (time.getAttribute('datetime') || time.textContent.trim()) : null,
+        job_id: card ? card.getAttribute('data-job-id') : null
+    };
+}));
+"""
+
+
+def dedupe_jobs(jobs):
+    """Drop jobs whose key was already seen, keeping the first occurrence."""
+    seen = set()
+    unique = []
+    for job in jobs:
+        key = job_key(job.get('link'))
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(job)
+    return unique
+
+
+def create_scraper(backend=None, primary=True):
+    """Create a scraper for the configured backend ('selenium' or 'http').
+
+    Only the ``primary`` session opens CHROME_USER_DATA_DIR; Chrome refuses
+    to start a second instance on a profile that is in use, so pool workers
+    pass ``primary=False`` and start from the shared cookies instead.
+    """
+    if (backend or SCRAPER_BACKEND) == 'http':
+        from http_scraper import LinkedInHttpScraper
+        return LinkedInHttpScraper(primary)
+    return LinkedInScraper(primary)
+
+
 class LinkedInScraper:
-    def __init__(self):
+    # Number of job cards on one results page
+    page_size = 25
+
+    def __init__(self, primary=True):
+        self.primary = primary
+        self.profile_dir = CHROME_USER_DATA_DIR if primary else None
         self.driver = None
+        self.last_extract_timing = {}
+        self.startup_time = None
+        self.last_page_bytes = None
+        self.last_result_count = None
+        self.over_cap = False
+        self.split_offset = None
+        self.page_answered = False
+        self.search_loaded = False
+        self.productive_searches = set()
+        self.pages_loaded = 0
+        self.logged_in = False
+        self.metrics = Metrics()
+        self.startup_reported = False
+        self.waits = WaitRecorder(callback=self.record_wait)
+        self.store = None
+        self.query_results = []
+        self.journal = None
         self.setup_driver()
 
+    def get_driver_path(self, refresh=False):
+        """Return the chromedriver path without a network lookup when possible.
+
+        ``refresh`` ignores the cached path and resolves it again.
+        """
+        if CHROMEDRIVER_PATH:
+            return CHROMEDRIVER_PATH
+        if not refresh:
+            try:
+                with open(CHROMEDRIVER_CACHE_FILE, encoding='utf-8') as f:
+                    cached = f.read().strip()
+                if cached and os.path.exists(cached):
+                    return cached
+            except OSError:
+                pass
+        path = ChromeDriverManager().install()
+        try:
+            os.makedirs(os.path.dirname(CHROMEDRIVER_CACHE_FILE) or '.', exist_ok=True)
+            with open(CHROMEDRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+                f.write(path)
+        except OSError as e:
+            logging.warning(f"Could not cache chromedriver path: {str(e)}")
+        return path
+
     def setup_driver(self):
         """Set up the Chrome WebDriver with appropriate options."""
+        start = time.perf_counter()
         chrome_options = Options()
-        # Remove headless mode to improve reliability
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--start-maximized')
+        if LEAN_DRIVER:
+            if HEADLESS:
+                chrome_options.add_argument('--headless=new')
+            chrome_options.add_argument(f'--window-size={WINDOW_SIZE}')
+            chrome_options.page_load_strategy = 'eager'
+            chrome_options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.managed_default_content_settings.media_stream': 2,
+                'profile.managed_default_content_settings.notifications': 2
+            })
+        else:
+            chrome_options.add_argument('--start-maximized')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        if self.profile_dir:
+            chrome_options.add_argument(f'--user-data-dir={os.path.abspath(self.profile_dir)}')
         
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        try:
+            self.driver = webdriver.Chrome(service=Service(self.get_driver_path()), options=chrome_options)
+        except SessionNotCreatedException as e:
+            if CHROMEDRIVER_PATH:
+                raise
+            # Chrome updated itself past the cached chromedriver; resolve a matching one and retry once
+            print("Cached chromedriver does not match Chrome, resolving it again")
+            logging.warning(f"Chrome session not created with the cached chromedriver: {str(e).splitlines()[0]}")
+            self.driver = webdriver.Chrome(service=Service(self.get_driver_path(refresh=True)), options=chrome_options)
+        count_webdriver_calls(self.driver, lambda: self.metrics.incr('webdriver_calls'))
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if LEAN_DRIVER:
+            # Block fonts, media and third-party trackers at the network layer
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        self.startup_time = time.perf_counter() - start
+        print(f"Chrome started in {self.startup_time:.2f}s ({'lean' if LEAN_DRIVER else 'full'} profile)")
+
+    def ensure_logged_in(self):
+        """Reuse the saved session if it is still valid, otherwise log in and save it."""
+        if self.logged_in and self.session_is_valid():
+            return True
+        if self.restore_session():
+            print("Reusing saved LinkedIn session")
+            self.logged_in = True
+            return True
+        if not self.login():
+            return False
+        self.logged_in = True
+        self.save_session()
+        return True
+
+    def restore_session(self):
+        """Load the saved session (profile dir or cookie file) and check that it still works."""
+        if not self.profile_dir:
+            if not os.path.exists(SESSION_FILE):
+                return False
+            try:
+                with open(SESSION_FILE, encoding='utf-8') as f:
+                    cookies = json.load(f)
+            except Exception as e:
+                print(f"Failed to read saved session: {str(e)}")
+                return False
+            if not self.apply_session_state(cookies):
+                return False
+        return self.session_is_valid()
+
+    def session_is_valid(self):
+        """Open the feed and check that LinkedIn does not send us back to the login page."""
+        try:
+            rate_controller().acquire(self.metrics)
+            self.driver.get(f'{LINKEDIN_BASE_URL}/feed/')
+            self.waits.wait(
+                self.driver, 'session_probe',
+                lambda driver: (
+                    any(marker in driver.current_url.lower() for marker in ('login', 'authwall', 'checkpoint')) or
+                    len(driver.find_elements(By.CSS_SELECTOR, 'nav.global-nav')) > 0
+                ),
+                WAIT_TIMEOUTS['session_probe']
+            )
+            url = self.driver.current_url.lower()
+            return not any(marker in url for marker in ('login', 'authwall', 'checkpoint'))
+        except Exception as e:
+            print(f"Saved session is not valid: {str(e)}")
+            return False
+
+    def save_session(self):
+        """Save the session cookies so the next run can skip the login flow."""
+        if self.profile_dir:
+            return
+        try:
+            os.makedirs(os.path.dirname(SESSION_FILE) or '.', exist_ok=True)
+            with open(SESSION_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self.get_session_state(), f)
+            os.chmod(SESSION_FILE, 0o600)
+        except Exception as e:
+            print(f"Failed to save session: {str(e)}")
 
     def login(self):
         """Log in to LinkedIn."""
         try:
             print("Starting LinkedIn login process...")
-            self.driver.get('https://www.linkedin.com/login')
-            time.sleep(5)  # Wait longer for page to load completely
+            rate_controller().acquire(self.metrics)
+            self.driver.get(f'{LINKEDIN_BASE_URL}/login')
             
             # Wait for email field and enter email
             print("Entering email...")
-            email_field = WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.ID, 'username'))
+            email_field = self.waits.wait(
+                self.driver, 'login_form', element_present('#username'), WAIT_TIMEOUTS['login_form']
             )
             email_field.clear()  # Clear any existing text
             email_field.send_keys(LINKEDIN_EMAIL)
-            time.sleep(2)  # Small delay between actions
 
             # Enter password
             print("Entering password...")
-            password_field = WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.ID, 'password'))
+            password_field = self.waits.wait(
+                self.driver, 'login_form', element_present('#password'), WAIT_TIMEOUTS['login_form']
             )
             password_field.clear()  # Clear any existing text
             password_field.send_keys(LINKEDIN_PASSWORD)
-            time.sleep(2)  # Small delay between actions
 
             # Click login button
             print("Clicking login button...")
-            login_button = WebDriverWait(self.driver, 20).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[type="submit"]'))
+            login_button = self.waits.wait(
+                self.driver, 'login_form',
+                EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[type="submit"]')),
+                WAIT_TIMEOUTS['login_form']
             )
             login_button.click()
 
@@ -78,14 +292,16 @@ class LinkedInScraper:
             print("Waiting for login to complete...")
             try:
                 # Wait for either the feed or the nav bar to appear
-                WebDriverWait(self.driver, 30).until(
+                self.waits.wait(
+                    self.driver, 'login_complete',
                     lambda driver: (
                         len(driver.find_elements(By.CSS_SELECTOR, 'nav.global-nav')) > 0 or
                         len(driver.find_elements(By.CSS_SELECTOR, '.feed-shared-update-v2')) > 0 or
                         'feed' in driver.current_url.lower() or
                         'jobs' in driver.current_url.lower() or
                         len(driver.find_elements(By.CSS_SELECTOR, '.jobs-search-results-list')) > 0
-                    )
+                    ),
+                    WAIT_TIMEOUTS['login_complete']
                 )
                 
                 # Additional verification
@@ -94,7 +310,11 @@ class LinkedInScraper:
                     return False
                     
                 print("Successfully logged in to LinkedIn")
-                time.sleep(5)  # Wait for the page to fully load after login
+                # Let the post-login redirects and requests settle
+                try:
+                    self.waits.wait(self.driver, 'post_login_idle', network_idle(), WAIT_TIMEOUTS['post_login_idle'])
+                except Exception:
+                    pass
                 return True
                 
             except Exception as e:
@@ -117,37 +337,124 @@ class LinkedInScraper:
                 pass
             return False
 
-    def search_jobs(self, keyword):
-        """Search for jobs with the given keyword."""
+    def get_session_state(self):
+        """Return the cookies of the authenticated session so other workers can reuse it."""
+        return self.driver.get_cookies()
+
+    def apply_session_state(self, cookies):
+        """Load cookies from an authenticated session into this driver."""
         try:
+            # Cookies can only be set for the domain currently loaded
+            rate_controller().acquire(self.metrics)
+            self.driver.get(LINKEDIN_BASE_URL)
+            for cookie in cookies:
+                cookie = {k: v for k, v in cookie.items() if k != 'sameSite'}
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception as e:
+                    logging.warning(f"Could not set cookie {cookie.get('name')}: {str(e)}")
+            return True
+        except Exception as e:
+            print(f"Failed to apply session state: {str(e)}")
+            return False
+
+    def search_jobs(self, keyword, location=None, known_ids=None, start=0, split=True):
+        """Search for jobs with the given keyword, yielding jobs page by page.
+
+        ``location`` is a search scope (see ``search_facets``). Stops paging at
+        the end of the results, or as soon as a page holds only jobs that are
+        in ``known_ids`` or older than MAX_DAYS_OLD. Each page is written to
+        the run journal before its jobs are yielded. ``search_loaded`` tells
+        whether the first page was answered at all. Sets ``over_cap`` when
+        the search has more results than LinkedIn will page through: with
+        ``split``, right after the first page if the reported count is over
+        MAX_RESULTS and the scope can be split (``split_offset`` is then the
+        offset to continue from), otherwise when paging reaches the cap.
+        """
+        known_ids = known_ids if known_ids is not None else set()
+        now = datetime.now()
+        self.over_cap = False
+        self.split_offset = None
+        self.search_loaded = False
+        self.last_result_count = None
+        for offset in range(start, MAX_RESULTS, self.page_size):
+            loaded = self.load_results_page(keyword, location, offset)
+            if offset == start:
+                self.search_loaded = self.page_answered
+            if not loaded:
+                return
+            self.pages_loaded += 1
+            self.metrics.incr('pages')
+            jobs = self.extract_job_data()
+            if not jobs:
+                return
+            self.productive_searches.add((keyword, location))
+            rate_controller().results_page()
+            if self.journal:
+                self.journal.record_page(keyword, location, offset + self.page_size, jobs)
+            yield from jobs
+            count = self.last_result_count
+            if split and offset == start and count and count > MAX_RESULTS and split_scope(location or LOCATIONS[0]):
+                print(f"{count} results is over the {MAX_RESULTS} cap, splitting the search")
+                self.over_cap = True
+                self.split_offset = offset + self.page_size
+                return
+            if all(job['job_id'] in known_ids or self.is_stale(job, now) for job in jobs):
+                print("No new jobs on this page, stopping pagination")
+                return
+            if len(jobs) < self.page_size:
+                return
+        # Every page up to the cap was full, so results beyond it were cut off
+        self.over_cap = True
+
+    def empty_page_is_suspicious(self, keyword, location):
+        """Return True if an empty first page hints at throttling rather than a search with no results.
+
+        Facet slices and split searches are often legitimately empty, so
+        only a configured location searched without filters, or a search
+        that returned results earlier, counts.
+        """
+        return is_base_location(location) or (keyword, location) in self.productive_searches
+
+    def load_results_page(self, keyword, location=None, start=0):
+        """Open the results page starting at offset ``start``.
+
+        Sets ``page_answered`` when LinkedIn answered with results or with
+        its no-results page, as opposed to a challenge or a timeout.
+        """
+        self.page_answered = False
+        try:
+            location = location or LOCATIONS[0]
             # Construct search URL with proper encoding and filters
-            encoded_keyword = keyword.replace(' ', '%20')
-            encoded_location = LOCATION.replace(' ', '%20')
-            search_url = f'https://www.linkedin.com/jobs/search/?keywords={encoded_keyword}&location={encoded_location}&f_TPR=r1209600'
+            params = dict({'keywords': keyword}, **search_params(location), start=start)
+            search_url = f'{LINKEDIN_BASE_URL}/jobs/search/?{urlencode(params)}'
             
-            print(f"\nSearching for jobs with keyword: {keyword}")
+            print(f"\nSearching for jobs with keyword: {keyword} in {scope_label(location)} (start={start})")
             print(f"Search URL: {search_url}")
             
-            # Navigate to search URL
-            self.driver.get(search_url)
-            time.sleep(5)  # Wait for page to load
+            # Navigate to search URL, backing off if LinkedIn answers with a challenge
+            if not rate_controller().navigate(self.driver, search_url, self.metrics):
+                print("LinkedIn kept redirecting to a challenge page, skipping this search")
+                return False
             
-            # First check if there are no matching jobs
+            # Wait until either job cards or the empty-results message appear
             try:
-                no_jobs_element = self.driver.find_element(By.CSS_SELECTOR, 'h1.t-24.t-black.t-normal.text-align-center')
-                if "No matching jobs found" in no_jobs_element.text:
+                outcome = self.waits.wait(
+                    self.driver, 'results',
+                    any_of(
+                        results=element_present(JOB_LINK_SELECTOR),
+                        empty=text_present(NO_RESULTS_SELECTOR, 'No matching jobs found')
+                    ),
+                    WAIT_TIMEOUTS['results']
+                )
+                self.page_answered = True
+                if outcome == 'empty':
                     print("No matching jobs found for this keyword, skipping to next search...")
+                    if start == 0 and self.empty_page_is_suspicious(keyword, location):
+                        rate_controller().empty_page(self.metrics)
                     return False
-            except:
-                # If we can't find the no results text, continue with normal search
-                pass
-            
-            # If we get here, there might be jobs, so wait for them to appear
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'a.job-card-list__title--link'))
-                )
-                print("Found job results!")
+                self.last_page_bytes, self.last_result_count = self.page_info()
+                print(f"Found job results! ({(self.last_page_bytes or 0) / 1024:.0f} KB transferred)")
                 return True
             except Exception as e:
                 print(f"Failed to find job results: {str(e)}")
@@ -157,112 +464,144 @@ class LinkedInScraper:
             print(f"Job search failed: {str(e)}")
             return False
 
+    def page_info(self):
+        """Return (bytes transferred, reported result count) for the current page; None if unavailable."""
+        try:
+            page_bytes, count_text = self.driver.execute_script(PAGE_INFO_SCRIPT, RESULT_COUNT_SELECTOR)
+            return int(page_bytes), parse_result_count(count_text)
+        except Exception:
+            return None, None
+
+    def scroll_results(self, max_rounds=20, settle=0.3):
+        """Scroll the results list until the number of loaded cards stops growing."""
+        count = -1
+        for _ in range(max_rounds):
+            self.driver.execute_script(SCROLL_RESULTS_SCRIPT, RESULTS_LIST_SELECTOR, JOB_LINK_SELECTOR)
+            try:
+                new_count = self.waits.wait(
+                    self.driver, 'scroll', element_count_stable(JOB_LINK_SELECTOR, settle, minimum=0),
+                    WAIT_TIMEOUTS['scroll']
+                )
+            except Exception:
+                new_count = len(self.driver.find_elements(By.CSS_SELECTOR, JOB_LINK_SELECTOR))
+            if new_count == count:
+                break
+            count = new_count
+        return count
+
     def extract_job_data(self):
-        """Extract job data from the current page."""
+        """Extract job data from the current page.
+
+        Scrolls the results list once, then reads every card in a single
+        ``execute_script`` call. Falls back to per-card extraction if the
+        batch script fails. Timings are stored in ``self.last_extract_timing``.
+        """
         jobs = []
+        timing = {'mode': 'batch', 'scroll': 0.0, 'extract': 0.0, 'cards': 0}
+        self.last_extract_timing = timing
         try:
-            # Wait a bit to ensure all jobs are loaded
-            time.sleep(3)
-            
-            # Find all job link elements
-            job_links = self.driver.find_elements(By.CSS_SELECTOR, 'a.job-card-list__title--link')
-            print(f"Found {len(job_links)} job links")
-            
-            if not job_links:
-                print("No job links found")
-                return jobs
+            start = time.perf_counter()
+            card_count = self.scroll_results()
+            timing['scroll'] = time.perf_counter() - start
+            print(f"Found {card_count} job links")
 
-            for link_element in job_links:
-                try:
-                    # Scroll element into view
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", link_element)
-                    time.sleep(1)
-                    
-                    # Get title from aria-label and link from href
-                    title = link_element.get_attribute('aria-label')
-                    link = link_element.get_attribute('href')
-                    
-                    if title and link:
-                        jobs.append({
-                            'title': title,
-                            'link': link
-                        })
-                        print(f"Added job: {title}")
-                        print(f"Link: {link}")
-                    
-                except Exception as e:
-                    print(f"Failed to extract job: {str(e)}")
-                    continue
+            start = time.perf_counter()
+            try:
+                cards = json.loads(self.driver.execute_script(EXTRACT_CARDS_SCRIPT, JOB_LINK_SELECTOR))
+            except Exception as e:
+                print(f"Batch extraction failed, falling back to per-card extraction: {str(e)}")
+                timing['mode'] = 'per_card'
+                cards = self.extract_job_cards()
+
+            for card in cards:
+                if card.get('title') and card.get('link'):
+                    card['job_id'] = card.get('job_id') or job_key(card['link'])
+                    jobs.append(card)
+            timing['extract'] = time.perf_counter() - start
+            timing['cards'] = len(jobs)
+            self.metrics.record('extract', timing['scroll'] + timing['extract'])
 
-            print(f"Successfully extracted {len(jobs)} jobs")
+            print(f"Successfully extracted {len(jobs)} jobs "
+                  f"(scroll {timing['scroll']:.2f}s, extract {timing['extract']:.2f}s, {timing['mode']})")
             return jobs
 
         except Exception as e:
             print(f"Failed to extract job data: {str(e)}")
             return jobs
 
-    def parse_posting_date(self, date_text):
+    def extract_job_cards(self):
+        """Extract title and link from each job card, one element at a time."""
+        jobs = []
+        for link_element in self.driver.find_elements(By.CSS_SELECTOR, JOB_LINK_SELECTOR):
+            try:
+                # Get title from aria-label and link from href
+                title = link_element.get_attribute('aria-label')
+                link = link_element.get_attribute('href')
+                if title and link:
+                    jobs.append({'title': title, 'link': link})
+            except Exception as e:
+                print(f"Failed to extract job: {str(e)}")
+                continue
+        return jobs
+
+    def is_stale(self, job, now=None):
+        """Return True if the job was listed more than MAX_DAYS_OLD days ago."""
+        listed = job.get('listed_time')
+        if not listed:
+            return False
+        now = now or datetime.now()
+        return (now - self.parse_posting_date(listed, now)).days > MAX_DAYS_OLD
+
+    def parse_posting_date(self, date_text, now=None):
         """Parse the posting date text into a datetime object."""
-        try:
-            if 'hour' in date_text or 'hours' in date_text:
-                hours = int(date_text.split()[0])
-                return datetime.now() - timedelta(hours=hours)
-            elif 'day' in date_text or 'days' in date_text:
-                days = int(date_text.split()[0])
-                return datetime.now() - timedelta(days=days)
-            elif 'week' in date_text or 'weeks' in date_text:
-                weeks = int(date_text.split()[0])
-                return datetime.now() - timedelta(weeks=weeks)
-            elif 'month' in date_text or 'months' in date_text:
-                months = int(date_text.split()[0])
-                return datetime.now() - timedelta(days=months * 30)
-            else:
-                return datetime.now()
-        except:
-            return datetime.now()
+        return parse_posting_date(date_text, now)
 
     def save_to_excel(self, jobs):
-        """Save job data to Excel file and commit to git."""
+        """Save job data to the job store, export the Excel file and commit to git."""
         try:
             if not jobs:
                 print("No jobs to save")
                 return False
                 
-            # Create DataFrame
-            df = pd.DataFrame(jobs)
-            
-            # Add timestamp
-            df['scraped_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Save to Excel file with better formatting
-            excel_file = 'linkedin_jobs.xlsx'
+            excel_file = EXCEL_FILE
             try:
-                # Read existing data if file exists
-                if os.path.exists(excel_file):
-                    existing_df = pd.read_excel(excel_file)
-                    # Combine with new data
-                    combined_df = pd.concat([existing_df, df], ignore_index=True)
-                else:
-                    combined_df = df
-                
-                # Remove duplicates based on title and link
-                combined_df = combined_df.drop_duplicates(subset=['title', 'link'], keep='first')
+                persist_start = time.perf_counter()
+                # Upsert into the store; only unseen job IDs count as new
+                seen_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                new_jobs = self.store.upsert(jobs, seen_at)
+                self.metrics.incr('new_jobs', len(new_jobs))
+                print(f"Saved {len(jobs)} jobs to the job store ({len(new_jobs)} new)")
+                if NEAR_DUPLICATES:
+                    from near_duplicates import NearDuplicateIndex
+                    reposts = NearDuplicateIndex(self.store.conn).index_pending()
+                    self.metrics.incr('near_duplicates', reposts)
+                    print(f"Clustered {reposts} new jobs as reposts of earlier ones")
                 
-                # Save to Excel with formatting
-                with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-                    combined_df.to_excel(writer, index=False, sheet_name='Jobs')
-                    # Auto-adjust column widths
-                    worksheet = writer.sheets['Jobs']
-                    for idx, col in enumerate(combined_df.columns):
-                        max_length = max(
-                            combined_df[col].astype(str).apply(len).max(),
-                            len(col)
-                        )
-                        worksheet.column_dimensions[chr(65 + idx)].width = min(max_length + 2, 100)
-                
-                print(f"Saved {len(jobs)} jobs to {excel_file}")
+                if OUTPUT_MODE == 'shards':
+                    # Write only this run's new jobs; the xlsx is derived on compaction
+                    from shards import write_shard
+                    shard = write_shard(new_jobs, seen_at)
+                    print(f"Wrote {len(new_jobs)} new jobs to {shard}" if shard else "No new jobs to shard")
+                    output_path = SHARDS_DIR
+                else:
+                    # Regenerate the Excel export from the store
+                    self.store.export_excel(excel_file)
+                    print(f"Exported {len(self.store)} jobs to {excel_file}")
+                    output_path = excel_file
+                self.metrics.record('persistence', time.perf_counter() - persist_start)
+
+                if SHEETS_OUTPUT:
+                    try:
+                        from sheets_sink import SheetsSink
+                        with self.metrics.span('sheets'):
+                            written = SheetsSink(self.store.conn).write(new_jobs, seen_at)
+                        print(f"Appended {written} new jobs to Google Sheets")
+                    except Exception as e:
+                        print(f"Failed to write to Google Sheets: {str(e)}")
+                        logging.error(f"Failed to write to Google Sheets: {str(e)}")
                 
                 # Git operations
+                git_start = time.perf_counter()
                 try:
                     import subprocess
                     print("\nStarting git operations...")
@@ -275,9 +614,9 @@ class LinkedInScraper:
                         subprocess.run(['git', 'config', 'user.name', 'LinkedIn Job Scraper'], check=True)
                         subprocess.run(['git', 'config', 'user.email', 'scraper@example.com'], check=True)
                     
-                    # Add the Excel file
-                    print("Adding Excel file to git...")
-                    subprocess.run(['git', 'add', excel_file], check=True)
+                    # Add the output files
+                    print(f"Adding {output_path} to git...")
+                    subprocess.run(['git', 'add', output_path], check=True)
                     
                     # Check if there are changes to commit
                     status = subprocess.run(['git', 'status', '--porcelain'], capture_output=True, text=True)
@@ -300,6 +639,7 @@ class LinkedInScraper:
                 except Exception as e:
                     print(f"Git operations failed: {str(e)}")
                     print("Continuing without git commit...")
+                self.metrics.record('git', time.perf_counter() - git_start)
                 
                 return True
                 
@@ -312,31 +652,20 @@ class LinkedInScraper:
             return False
 
     def test_google_sheets(self):
-        """Test Google Sheets access by writing a test row."""
+        """Test Google Sheets access by appending a test row."""
         try:
             print("\nTesting Google Sheets access...")
             
             # Check if credentials file exists
-            if not os.path.exists('credentials.json'):
-                print("Error: credentials.json file not found!")
+            if not os.path.exists(GOOGLE_CREDENTIALS_FILE):
+                print(f"Error: {GOOGLE_CREDENTIALS_FILE} file not found!")
                 return False
                 
-            # Set up credentials
-            import gspread
-            from google.oauth2.service_account import Credentials
-            
-            scope = ['https://www.googleapis.com/auth/spreadsheets',
-                    'https://www.googleapis.com/auth/drive']
-            
-            print("Loading credentials...")
-            creds = Credentials.from_service_account_file('credentials.json', scopes=scope)
-            
-            print("Authorizing with Google...")
-            client = gspread.authorize(creds)
+            from sheets_sink import open_worksheet, SheetsSink, SHEETS_HEADER
             
             print("Opening spreadsheet...")
             try:
-                sheet = client.open_by_url('https://docs.google.com/spreadsheets/d/17MUOxp8GwaJMA1YYpQkNulNavZlnmRQwh4K3TyAhXvM/edit?usp=sharing')
+                worksheet = open_worksheet(GOOGLE_SHEET_URL, GOOGLE_CREDENTIALS_FILE)
             except Exception as e:
                 print(f"Error opening spreadsheet: {str(e)}")
                 print("Please make sure:")
@@ -344,27 +673,22 @@ class LinkedInScraper:
                 print("2. The spreadsheet is shared with the service account email")
                 return False
             
-            print("Getting worksheet...")
-            worksheet = sheet.get_worksheet(0)
-            
             # Create test data
-            test_data = {
+            test_job = {
+                'job_id': 'test',
                 'title': 'Test Job',
-                'link': 'https://test.com',
-                'scraped_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'link': 'https://test.com'
             }
             
             print("Writing test data...")
-            # Get existing data
-            existing_data = worksheet.get_all_values()
-            if existing_data:
-                # Add to existing data
-                next_row = len(existing_data) + 1
-                worksheet.update(f'A{next_row}', [list(test_data.values())])
-            else:
-                # Create new sheet with headers
-                worksheet.update('A1', [list(test_data.keys())])
-                worksheet.update('A2', [list(test_data.values())])
+            # Lay the row out in the sheet's own column order, adding the header to an empty sheet
+            sink = SheetsSink(worksheet=worksheet)
+            header = worksheet.row_values(1)
+            sink.header = header or list(SHEETS_HEADER)
+            rows = [] if header else [sink.header]
+            rows.append(sink.to_row(test_job, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            # One append call; the API finds the end of the table itself
+            worksheet.append_rows(rows, value_input_option='RAW', table_range='A1')
             
             print("Test data written successfully!")
             print("Please check your Google Sheet to verify the test data was added.")
@@ -375,46 +699,87 @@ class LinkedInScraper:
             print("Error details:", e.__class__.__name__)
             return False
 
-    def scrape(self):
-        """Main scraping function."""
+    def scrape(self, close=True):
+        """Main scraping function.
+
+        With ``close=False`` the browser is left running so a daemon can reuse it.
+        Timings and counters for the run are written by ``write_metrics``.
+        """
+        self.metrics = Metrics()
+        self.waits.reset()
+        if self.startup_time is not None and not self.startup_reported:
+            self.metrics.record('startup', self.startup_time)
+            self.startup_reported = True
         try:
-            # Login first
-            if not self.login():
+            # Login first, reusing the saved session when possible
+            with self.metrics.span('login'):
+                logged_in = self.ensure_logged_in()
+            if not logged_in:
                 print("Failed to login to LinkedIn")
                 return False
 
             print("Starting job search process...")
-            all_jobs = []
-            
-            for keyword in JOB_KEYWORDS:
-                try:
-                    print(f"\nSearching for: {keyword}")
-                    
-                    # Search for jobs
-                    if not self.search_jobs(keyword):
-                        continue
-                    
-                    # Extract job data
-                    jobs = self.extract_job_data()
-                    if jobs:
-                        all_jobs.extend(jobs)
-                        print(f"Found {len(jobs)} jobs for {keyword}")
-                    
-                    time.sleep(2)  # Short wait between searches
-                    
-                except Exception as e:
-                    print(f"Error with keyword {keyword}: {str(e)}")
-                    continue
+            self.store = JobStore()
+            known_ids = self.store.known_ids()
+            planner = None
+            if QUERY_PLANNER:
+                from query_planner import QueryPlanner
+                planner = QueryPlanner(self.store.conn)
+                work_items = planner.plan(JOB_KEYWORDS, search_scopes())
+            else:
+                work_items = [(keyword, scope) for keyword in JOB_KEYWORDS for scope in search_scopes()]
+            self.metrics.set('planned_searches', len(work_items))
+
+            # Replay what an interrupted run already extracted and skip the searches it finished
+            self.journal = RunJournal()
+            replayed = self.journal.load()
+            if replayed:
+                print(f"Resuming interrupted run: {replayed} journaled jobs, "
+                      f"{len(self.journal.done)} searches already finished")
+                self.metrics.set('replayed_jobs', replayed)
+            work_items = [
+                (keyword, location, self.journal.next_start(keyword, location))
+                for keyword, location in work_items if not self.journal.is_done(keyword, location)
+            ]
+            # Journaled slices of split searches count towards the search they came from
+            found = {}
+            for (keyword, location), job_ids in self.journal.found.items():
+                found.setdefault((keyword, scope_root(location, search_scopes())), []).extend(job_ids)
+            self.query_results = [
+                (keyword, location, job_ids, sum(1 for job_id in set(job_ids) if job_id not in known_ids))
+                for (keyword, location), job_ids in found.items()
+            ]
+            deadline = time.time() + RUN_TIME_BUDGET if RUN_TIME_BUDGET else None
+            if NUM_WORKERS > 1:
+                from worker_pool import crawl_parallel
+                all_jobs = crawl_parallel(self, work_items, known_ids, deadline=deadline)
+            else:
+                all_jobs = self.crawl(work_items, known_ids, deadline)
+            all_jobs = dedupe_jobs(self.journal.jobs + all_jobs)
+
+            print("Page readiness waits:")
+            self.waits.print_summary()
+
+            self.metrics.set('unique_jobs', len(all_jobs))
 
-            # Save results if any jobs were found
+            # Fetch details for new jobs only, dropping stale ones before they reach storage
+            if ENRICH_DETAILS:
+                from enrichment import enrich_jobs
+                new_jobs = [job for job in all_jobs if job['job_id'] not in known_ids]
+                seen_jobs = [job for job in all_jobs if job['job_id'] in known_ids]
+                all_jobs = seen_jobs + enrich_jobs(new_jobs, metrics=self.metrics)
+
+            # Save results if any jobs were found; the journal is kept until they are stored
             if all_jobs:
                 if self.save_to_excel(all_jobs):
+                    self.finish_run(planner)
                     print(f"\nSaved {len(all_jobs)} jobs to Google Sheets")
                     return True
                 else:
                     print("Failed to save jobs to Google Sheets")
                     return False
             else:
+                self.finish_run(planner)
                 print("No jobs found")
                 return False
 
@@ -422,9 +787,180 @@ class LinkedInScraper:
             print(f"Scraping failed: {str(e)}")
             return False
         finally:
-            self.close()
+            if self.journal:
+                self.journal.close()
+            self.write_metrics()
+            if close:
+                self.close()
+            elif self.store:
+                self.store.close()
+                self.store = None
+
+    def finish_run(self, planner=None):
+        """Record search yields for the planner and drop the journal once jobs are stored."""
+        if planner:
+            planner.record(self.query_results)
+        self.journal.clear()
+
+    def record_wait(self, name, seconds, ok):
+        """Feed a finished readiness wait into the run metrics."""
+        self.metrics.record('wait', seconds, step=name)
+        if not ok:
+            self.metrics.incr('wait_timeouts')
+
+    def write_metrics(self):
+        """Write the run's JSON summary and Prometheus textfile."""
+        counters = self.metrics.counters
+        self.metrics.incr('duplicates', max(counters['jobs_found'] - counters['new_jobs'], 0))
+        elapsed = (datetime.now() - self.metrics.started_at).total_seconds()
+        if elapsed > 0:
+            self.metrics.set('requests_per_minute', round(counters.get('requests', 0) * 60 / elapsed, 2))
+        self.metrics.set('request_rate_limit', rate_controller().rate)
+        try:
+            path = self.metrics.write()
+            print(f"Run metrics written to {path}")
+        except Exception as e:
+            print(f"Failed to write metrics: {str(e)}")
+
+    def crawl(self, work_items, known_ids=None, deadline=None):
+        """Search and extract every (keyword, scope[, start]) work item in this session.
+
+        No new search starts after ``deadline`` (a ``time.time()`` value).
+        Each finished search is added to ``query_results`` for the query planner.
+        """
+        all_jobs = []
+        for keyword, location, *rest in work_items:
+            all_jobs.extend(self.crawl_search(keyword, location, rest[0] if rest else 0, known_ids, deadline))
+        return all_jobs
+
+    def crawl_search(self, keyword, location, start=0, known_ids=None, deadline=None):
+        """Run one search, then its narrower slices if it was over the result cap.
+
+        The jobs found by the slices count towards this search in ``query_results``.
+        """
+        found = []
+        all_jobs = self.crawl_scope(keyword, location, start, known_ids, deadline, found)
+        if found:
+            job_ids = [job_id for ids in found for job_id in ids]
+            new_count = sum(1 for job_id in set(job_ids) if not known_ids or job_id not in known_ids)
+            self.query_results.append((keyword, location, job_ids, new_count))
+        return all_jobs
+
+    def crawl_scope(self, keyword, location, start, known_ids, deadline, found):
+        """Search one scope and, if it is over the cap, its slices; each search's job IDs go into ``found``."""
+        if deadline and time.time() >= deadline:
+            print(f"Run time budget reached, skipping '{keyword}' ({scope_label(location)})")
+            return []
+        all_jobs = []
+        try:
+            print(f"\nSearching for: {keyword} ({scope_label(location)})")
+            
+            # Page through the results as they are parsed
+            with self.metrics.span('search', keyword=keyword, location=location):
+                jobs = list(self.search_jobs(keyword, location, known_ids, start))
+            over_cap, split_offset = self.over_cap, self.split_offset
+            self.metrics.incr('jobs_found', len(jobs))
+            # A search that never got an answer (challenge, timeout) says nothing about its yield
+            if self.search_loaded:
+                found.append([job['job_id'] for job in jobs])
+            if jobs:
+                all_jobs.extend(jobs)
+                print(f"Found {len(jobs)} jobs for {keyword}")
+            
+        except Exception as e:
+            print(f"Error with keyword {keyword}: {str(e)}")
+            return all_jobs
+
+        # Partition an over-cap search until every slice fits under the cap
+        slices = split_scope(location) if over_cap else []
+        if slices:
+            print(f"Splitting '{keyword}' ({scope_label(location)}) into {len(slices)} narrower searches")
+            self.metrics.incr('split_searches', len(slices))
+            for scope in slices:
+                if self.journal and self.journal.is_done(keyword, scope):
+                    continue
+                scope_start = self.journal.next_start(keyword, scope) if self.journal else 0
+                all_jobs.extend(self.crawl_scope(keyword, scope, scope_start, known_ids, deadline, found))
+
+            # Postings without a value for the split facet match no slice, so page the unsplit
+            # search on to the cap; it is date-sorted and interleaves jobs the slices returned with
+            # ones they missed, so only stale pages stop it, not pages of already known jobs
+            if split_offset is not None and not (deadline and time.time() >= deadline):
+                try:
+                    seen = {job['job_id'] for job in all_jobs}
+                    with self.metrics.span('search', keyword=keyword, location=location):
+                        jobs = list(self.search_jobs(keyword, location, set(), split_offset, split=False))
+                    if self.search_loaded:
+                        found.append([job['job_id'] for job in jobs])
+                    jobs = [job for job in jobs if job['job_id'] not in seen]
+                    self.metrics.incr('jobs_found', len(jobs))
+                    all_jobs.extend(jobs)
+                except Exception as e:
+                    print(f"Error with keyword {keyword}: {str(e)}")
+                    return all_jobs
+
+        # A dead browser ends a search early, so only a healthy one checkpoints it as finished;
+        # a split search only counts as finished once its slices are
+        if self.journal and self.is_healthy():
+            self.journal.record_done(keyword, location)
+        return all_jobs
+
+    def is_healthy(self):
+        """Return True if the browser still answers commands."""
+        try:
+            return self.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def browser_rss_mb(self):
+        """Return the resident memory of chromedriver and its Chrome children in MB."""
+        try:
+            root_pid = self.driver.service.process.pid
+        except Exception:
+            return None
+        try:
+            import psutil
+            root = psutil.Process(root_pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except ImportError:
+            pass
+        except Exception:
+            return None
+
+        # Without psutil, walk /proc for the process tree (Linux only)
+        try:
+            parents = {}
+            for entry in os.listdir('/proc'):
+                if entry.isdigit():
+                    try:
+                        with open(f'/proc/{entry}/stat') as f:
+                            parents[int(entry)] = int(f.read().rsplit(')', 1)[1].split()[1])
+                    except OSError:
+                        continue
+            tree = {root_pid}
+            changed = True
+            while changed:
+                children = {pid for pid, ppid in parents.items() if ppid in tree} - tree
+                tree |= children
+                changed = bool(children)
+            total_kb = 0
+            for pid in tree:
+                try:
+                    with open(f'/proc/{pid}/status') as f:
+                        for line in f:
+                            if line.startswith('VmRSS:'):
+                                total_kb += int(line.split()[1])
+                except OSError:
+                    continue
+            return total_kb / 1024
+        except OSError:
+            return None
 
     def close(self):
-        """Close the WebDriver."""
+        """Close the WebDriver and the job store."""
         if self.driver:
-            self.driver.quit() 
\ No newline at end of file
+            self.driver.quit()
+        if self.store:
+            self.store.close()
+            self.store = None 
\ No newline at end of file
@@ -1,54 +1,189 @@
-import schedule
-import time
-from linkedin_scraper import LinkedInScraper
-import logging
 import os
+import sys
+import json
+import glob
+import logging
+import argparse
+
+# Heavy modules (selenium, webdriver_manager, numpy) are imported inside the
+# commands that need them, so export/stats/compact start without a browser stack
+
+
+def setup_logging():
+    from config import LOGS_DIR
+    # Create logs directory if it doesn't exist
+    if not os.path.exists(LOGS_DIR):
+        os.makedirs(LOGS_DIR)
+
+    # Set up logging
+    logging.basicConfig(
+        filename=os.path.join(LOGS_DIR, 'scraper.log'),
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
 
 def scrape_jobs():
     """Main function to scrape jobs."""
+    from linkedin_scraper import create_scraper
     try:
         print("Starting job scraping process...")
-        scraper = LinkedInScraper()
+        scraper = create_scraper()
         success = scraper.scrape()
-        
+
         if success:
             print("Job scraping completed successfully")
             logging.info("Job scraping completed successfully")
         else:
             print("Job scraping failed. Check logs for details.")
             logging.error("Job scraping failed")
-            
+        return success
+
     except Exception as e:
         print(f"Error during job scraping: {str(e)}")
         logging.error(f"Error during job scraping: {str(e)}")
+        return False
 
-def main():
-    # Create logs directory if it doesn't exist
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-        
-    # Set up logging
-    logging.basicConfig(
-        filename='logs/scraper.log',
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s'
-    )
-    
+
+def cmd_scrape(args):
+    """Run one scrape and exit."""
+    if args.backend:
+        os.environ['SCRAPER_BACKEND'] = args.backend
+    setup_logging()
+    return 0 if scrape_jobs() else 1
+
+
+def cmd_daemon(args):
+    """Run on a schedule, keeping the browser warm between runs."""
+    setup_logging()
+    from daemon import ScraperDaemon
     print("Starting LinkedIn Job Scraper...")
     logging.info("Starting LinkedIn Job Scraper...")
-    
-    # Run immediately on startup
-    scrape_jobs()
-    
-    # Schedule to run every two days
-    schedule.every(2).days.at("09:00").do(scrape_jobs)
-    
-    print("Scheduler started. Will run every two days at 09:00 AM.")
-    logging.info("Scheduler started. Will run every two days at 09:00 AM.")
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
+
+    # Run immediately on startup, then on schedule, keeping the browser warm
+    ScraperDaemon().run_forever(run_immediately=not args.no_immediate)
+    return 0
+
+
+def cmd_export(args):
+    """Export the job store to Excel without scraping."""
+    from config import EXCEL_FILE, NEAR_DUPLICATES
+    from job_store import JobStore
+    output = args.output or EXCEL_FILE
+    store = JobStore()
+    try:
+        if NEAR_DUPLICATES:
+            from near_duplicates import NearDuplicateIndex
+            NearDuplicateIndex(store.conn).index_pending()
+        store.export_excel(output)
+        print(f"Exported {len(store)} jobs to {output}")
+    finally:
+        store.close()
+    return 0
+
+
+def cmd_stats(args):
+    """Print a summary of the stored jobs and the last run."""
+    from config import JOBS_DB, METRICS_DIR
+    from job_store import JobStore
+    if not os.path.exists(JOBS_DB):
+        print(f"No job store at {JOBS_DB}")
+        return 1
+    store = JobStore()
+    try:
+        conn = store.conn
+        total, clusters, first, last = conn.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT cluster_id), MIN(first_seen), MAX(first_seen) FROM jobs'
+        ).fetchone()
+        print(f"Jobs: {total} ({clusters} after merging reposts)")
+        print(f"First seen: {first} .. {last}")
+        print("New jobs per day (last 7 days):")
+        for day, count in conn.execute('''
+            SELECT substr(first_seen, 1, 10) AS day, COUNT(*) FROM jobs
+            WHERE first_seen >= date('now', 'localtime', '-7 days') GROUP BY day ORDER BY day
+        '''):
+            print(f"  {day}: {count}")
+        print("Top companies:")
+        for company, count in conn.execute('''
+            SELECT company, COUNT(*) AS n FROM jobs WHERE company IS NOT NULL AND company != ''
+            GROUP BY company ORDER BY n DESC, company LIMIT ?
+        ''', (args.top,)):
+            print(f"  {company}: {count}")
+        has_planner = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'query_runs'"
+        ).fetchone()
+        if has_planner:
+            print("Average new jobs per search (recent runs):")
+            for keyword, location, runs, new in conn.execute('''
+                SELECT keyword, location, COUNT(*), AVG(new) FROM query_runs
+                GROUP BY keyword, location ORDER BY AVG(new) DESC
+            '''):
+                print(f"  {keyword} ({location}): {new:.1f} over {runs} runs")
+    finally:
+        store.close()
+
+    runs = sorted(glob.glob(os.path.join(METRICS_DIR, 'run-*.json')))
+    if runs:
+        with open(runs[-1], encoding='utf-8') as f:
+            metrics = json.load(f)
+        counters = metrics['counters']
+        print(f"Last run: {metrics['started_at']}, {metrics['duration_seconds']:.0f}s, "
+              f"{counters.get('jobs_found', 0)} jobs found, {counters.get('new_jobs', 0)} new, "
+              f"{counters.get('pages', 0)} pages, {counters.get('throttle_events', 0)} throttle events")
+    return 0
+
+
+def cmd_compact(args):
+    """Merge finished months of shards into snapshots and export the Excel file."""
+    import shards
+    shards.compact()
+    return 0
+
+
+def cmd_bench(args):
+    """Run the offline benchmark suite, passing through its arguments."""
+    import subprocess
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'run_benchmarks.py')
+    # A separate interpreter, because the benchmarks set environment variables before importing config
+    return subprocess.call([sys.executable, script] + args.bench_args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='LinkedIn job scraper for Israel.')
+    commands = parser.add_subparsers(dest='command')
+
+    scrape = commands.add_parser('scrape', help='run one scrape and exit')
+    scrape.add_argument('--backend', choices=['selenium', 'http'], help='override SCRAPER_BACKEND')
+    scrape.set_defaults(func=cmd_scrape)
+
+    daemon = commands.add_parser('daemon', help='run on a schedule with a warm browser (default)')
+    daemon.add_argument('--no-immediate', action='store_true', help='wait for the first scheduled run')
+    daemon.set_defaults(func=cmd_daemon)
+
+    export = commands.add_parser('export', help='export the job store to Excel')
+    export.add_argument('--output', help='Excel file to write (default: EXCEL_FILE)')
+    export.set_defaults(func=cmd_export)
+
+    stats = commands.add_parser('stats', help='summarize stored jobs and the last run')
+    stats.add_argument('--top', type=int, default=5, help='number of companies to list')
+    stats.set_defaults(func=cmd_stats)
+
+    compact = commands.add_parser('compact', help='compact shards and export Excel')
+    compact.set_defaults(func=cmd_compact)
+
+    bench = commands.add_parser('bench', help='run the offline benchmarks')
+    bench.add_argument('bench_args', nargs=argparse.REMAINDER, help='arguments for run_benchmarks.py')
+    bench.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        # No subcommand keeps the original behaviour: run now, then on schedule
+        args = build_parser().parse_args(['daemon'])
+    return args.func(args)
+
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from config import METRICS_DIR, PROMETHEUS_TEXTFILE
+
+METRIC_PREFIX = 'linkedin_scraper'
+
+# Counters every run reports, even when they stay at zero
+DEFAULT_COUNTERS = [
+    'jobs_found', 'new_jobs', 'duplicates', 'pages', 'requests', 'retries', 'throttle_events', 'webdriver_calls'
+]
+
+
+def count_webdriver_calls(driver, callback=None):
+    """Count every command the driver sends to chromedriver. Returns the counter dict."""
+    counter = {'calls': 0}
+    executor = driver.command_executor
+    original = executor.execute
+
+    def execute(command, params):
+        counter['calls'] += 1
+        if callback:
+            callback()
+        return original(command, params)
+
+    executor.execute = execute
+    return counter
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(labels):
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items()))
+
+
+class Metrics:
+    """Timing spans, counters and gauges for one scraping run."""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.lock = threading.Lock()
+        self.spans = {}
+        self.counters = {name: 0 for name in DEFAULT_COUNTERS}
+        self.gauges = {}
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time the enclosed block as stage ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, **labels)
+
+    def record(self, name, seconds, **labels):
+        """Add a duration to stage ``name``."""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            entry = self.spans.setdefault(key, {'count': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+
+    def incr(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def snapshot(self):
+        """Return the metrics as plain data (JSON- and pickle-friendly)."""
+        with self.lock:
+            return {
+                'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'duration_seconds': round((datetime.now() - self.started_at).total_seconds(), 3),
+                'spans': [
+                    {'name': name, 'labels': dict(labels), 'count': entry['count'],
+                     'total_seconds': round(entry['total'], 4), 'max_seconds': round(entry['max'], 4)}
+                    for (name, labels), entry in sorted(self.spans.items())
+                ],
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges)
+            }
+
+    def merge(self, snapshot):
+        """Add another run's snapshot (e.g. from a worker) into these metrics."""
+        with self.lock:
+            for span in snapshot['spans']:
+                key = (span['name'], tuple(sorted(span['labels'].items())))
+                entry = self.spans.setdefault(key, {'count': 0, 'total': 0.0, 'max': 0.0})
+                entry['count'] += span['count']
+                entry['total'] += span['total_seconds']
+                entry['max'] = max(entry['max'], span['max_seconds'])
+            for name, value in snapshot['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            f'# HELP {METRIC_PREFIX}_stage_seconds_total Time spent in each stage of the last run.',
+            f'# TYPE {METRIC_PREFIX}_stage_seconds_total gauge'
+        ]
+        for span in snapshot['spans']:
+            labels = _label_text(dict(span['labels'], stage=span['name']))
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_total{{{labels}}} {span["total_seconds"]}')
+        lines.append(f'# TYPE {METRIC_PREFIX}_stage_count gauge')
+        for span in snapshot['spans']:
+            labels = _label_text(dict(span['labels'], stage=span['name']))
+            lines.append(f'{METRIC_PREFIX}_stage_count{{{labels}}} {span["count"]}')
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f'# TYPE {METRIC_PREFIX}_{name} gauge')
+            lines.append(f'{METRIC_PREFIX}_{name} {value}')
+        for name, value in sorted(snapshot['gauges'].items()):
+            lines.append(f'# TYPE {METRIC_PREFIX}_{name} gauge')
+            lines.append(f'{METRIC_PREFIX}_{name} {value}')
+        lines.append(f'# TYPE {METRIC_PREFIX}_run_duration_seconds gauge')
+        lines.append(f'{METRIC_PREFIX}_run_duration_seconds {snapshot["duration_seconds"]}')
+        lines.append(f'# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge')
+        lines.append(f'{METRIC_PREFIX}_last_run_timestamp_seconds {int(self.started_at.timestamp())}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory=METRICS_DIR, textfile=PROMETHEUS_TEXTFILE):
+        """Write a JSON summary for this run and replace the Prometheus textfile."""
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f"run-{self.started_at.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+        # Write atomically so a textfile collector never reads a partial file
+        os.makedirs(os.path.dirname(textfile) or '.', exist_ok=True)
+        tmp_path = textfile + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, textfile)
+        return json_path
@@ -0,0 +1,167 @@
+import re
+import zlib
+import numpy as np
+from config import (
+    MINHASH_PERMUTATIONS, LSH_BANDS, NEAR_DUPLICATE_THRESHOLD, NEAR_DUPLICATE_TITLE_THRESHOLD,
+    DESCRIPTION_SHINGLE_WORDS
+)
+
+# Universal hashing (a * x + b) mod p; a and b stay below 2**31 so a * x + b fits in 64 bits
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+_random = np.random.RandomState(20240101)
+PERMUTATION_A = _random.randint(1, 1 << 31, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+PERMUTATION_B = _random.randint(0, 1 << 31, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+
+
+def normalize_text(text):
+    """Lower-case text and reduce it to words separated by single spaces."""
+    return re.sub(r'[\W_]+', ' ', str(text or '').lower()).strip()
+
+
+def shingles(job):
+    """Return the shingle set of a job.
+
+    Character 4-grams of the company and title catch small wording changes
+    in short fields; word 3-grams of the description catch reposted text.
+    """
+    head = normalize_text(f"{job.get('company') or ''} {job.get('title') or ''}")
+    result = {'t:' + head[i:i + 4] for i in range(max(len(head) - 3, 1))} if head else set()
+    words = normalize_text(job.get('description')).split()[:DESCRIPTION_SHINGLE_WORDS]
+    result.update('d:' + ' '.join(words[i:i + 3]) for i in range(len(words) - 2))
+    return result
+
+
+def title_similarity(a, b):
+    """Return the Jaccard similarity of two titles' character 4-grams."""
+    a, b = normalize_text(a), normalize_text(b)
+    a = {a[i:i + 4] for i in range(max(len(a) - 3, 1))} if a else set()
+    b = {b[i:i + 4] for i in range(max(len(b) - 3, 1))} if b else set()
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def minhash(shingle_set):
+    """Return the MinHash signature of a shingle set, or None if it is empty."""
+    if not shingle_set:
+        return None
+    hashes = np.array([zlib.crc32(shingle.encode('utf-8')) for shingle in shingle_set], dtype=np.uint64)
+    permuted = (np.outer(hashes, PERMUTATION_A) + PERMUTATION_B) % MERSENNE_PRIME & MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_buckets(signature, bands=LSH_BANDS):
+    """Yield (band, bucket) keys; similar signatures share at least one with high probability."""
+    rows = len(signature) // bands
+    for band in range(bands):
+        yield band, zlib.crc32(signature[band * rows:(band + 1) * rows].tobytes())
+
+
+def similarity(a, b):
+    """Estimate the Jaccard similarity of two shingle sets from their signatures."""
+    return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index that clusters reposts of the same job under one cluster_id.
+
+    Signatures and LSH buckets live in the job database next to the jobs.
+    A job joins the cluster of its most similar earlier job at the same
+    company when their estimated similarity reaches ``threshold`` and their
+    titles alone reach ``title_threshold`` (descriptions often open with the
+    same company blurb for every role); otherwise it starts its own cluster
+    (``cluster_id`` = its job ID). Jobs without a company are never clustered.
+    """
+
+    def __init__(self, conn, threshold=NEAR_DUPLICATE_THRESHOLD, bands=LSH_BANDS,
+                 title_threshold=NEAR_DUPLICATE_TITLE_THRESHOLD):
+        self.conn = conn
+        self.threshold = threshold
+        self.title_threshold = title_threshold
+        self.bands = bands
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS job_signatures (
+                    job_id TEXT PRIMARY KEY,
+                    signature BLOB
+                )
+            ''')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS job_buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    job_id TEXT NOT NULL
+                )
+            ''')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS job_buckets_key ON job_buckets (band, bucket)')
+
+    def candidates(self, signature):
+        """Return the job IDs sharing an LSH bucket with ``signature``."""
+        found = set()
+        for band, bucket in band_buckets(signature, self.bands):
+            found.update(row[0] for row in self.conn.execute(
+                'SELECT job_id FROM job_buckets WHERE band = ? AND bucket = ?', (band, bucket)
+            ))
+        return found
+
+    def find_match(self, signature, company, title):
+        """Return (job_id, similarity) of the closest indexed job of ``company`` above the thresholds, or None."""
+        candidates = list(self.candidates(signature))
+        best = None
+        for start in range(0, len(candidates), 500):
+            chunk = candidates[start:start + 500]
+            rows = self.conn.execute(
+                f'SELECT s.job_id, s.signature, j.company, j.title FROM job_signatures AS s JOIN jobs AS j USING (job_id) '
+                f'WHERE s.job_id IN ({", ".join("?" * len(chunk))})',
+                chunk
+            )
+            for job_id, blob, candidate_company, candidate_title in rows:
+                # Similar titles at different companies are different jobs
+                if blob is None or normalize_text(candidate_company) != company:
+                    continue
+                score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+                if score < self.threshold or (best is not None and score <= best[1]):
+                    continue
+                # A shared company blurb can carry the score for different roles, so the titles must match too
+                if title_similarity(title, candidate_title) >= self.title_threshold:
+                    best = (job_id, score)
+        return best
+
+    def add(self, job):
+        """Index one stored job and assign its cluster. Returns the cluster it joined, or None."""
+        company = normalize_text(job.get('company'))
+        # Without a company, a matching title alone says nothing about the posting
+        signature = minhash(shingles(job)) if company else None
+        if signature is None:
+            # Nothing to compare; remember the job so it is not picked up again
+            self.conn.execute('INSERT OR REPLACE INTO job_signatures (job_id, signature) VALUES (?, NULL)',
+                              (job['job_id'],))
+            return None
+        match = self.find_match(signature, company, job.get('title'))
+        cluster_id = None
+        if match:
+            cluster_id = self.conn.execute(
+                'SELECT cluster_id FROM jobs WHERE job_id = ?', (match[0],)
+            ).fetchone()[0] or match[0]
+            self.conn.execute('UPDATE jobs SET cluster_id = ? WHERE job_id = ?', (cluster_id, job['job_id']))
+        self.conn.execute('INSERT OR REPLACE INTO job_signatures (job_id, signature) VALUES (?, ?)',
+                          (job['job_id'], signature.tobytes()))
+        self.conn.executemany(
+            'INSERT INTO job_buckets (band, bucket, job_id) VALUES (?, ?, ?)',
+            [(band, bucket, job['job_id']) for band, bucket in band_buckets(signature, self.bands)]
+        )
+        return cluster_id
+
+    def index_pending(self):
+        """Index every stored job without a signature, oldest first. Returns how many were reposts."""
+        cursor = self.conn.execute('''
+            SELECT job_id, title, company, description FROM jobs
+            WHERE job_id NOT IN (SELECT job_id FROM job_signatures)
+            ORDER BY first_seen, job_id
+        ''')
+        pending = [dict(zip(('job_id', 'title', 'company', 'description'), row)) for row in cursor]
+        reposts = 0
+        with self.conn:
+            for job in pending:
+                if self.add(job):
+                    reposts += 1
+        return reposts
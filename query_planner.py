@@ -0,0 +1,191 @@
+import os
+import re
+import json
+import logging
+from datetime import datetime
+from config import (
+    PLANNER_WINDOW, PLANNER_MIN_RUNS, PLANNER_REDUNDANT_COVERAGE, PLANNER_RECHECK_EVERY, PLANNER_HISTORY_FILE
+)
+
+
+def normalize_query(keyword):
+    """Lower-case a keyword and collapse whitespace so identical searches compare equal."""
+    return re.sub(r'\s+', ' ', keyword or '').strip().lower()
+
+
+class QueryPlanner:
+    """Chooses which (keyword, location) searches to run, and in what order.
+
+    Every run records how many jobs and new jobs each search returned and
+    which job IDs it saw, in the job database. Searches are ordered by their
+    recent new-job yield; a search whose past results are almost all covered
+    by the searches ahead of it, or that has found nothing new lately, only
+    runs every ``recheck_every`` runs.
+
+    The history is also saved to ``history_file``, which survives a rebuilt
+    job database (the GitHub Actions workflow commits it with the shards).
+    """
+
+    def __init__(self, conn, window=PLANNER_WINDOW, min_runs=PLANNER_MIN_RUNS,
+                 redundant_coverage=PLANNER_REDUNDANT_COVERAGE, recheck_every=PLANNER_RECHECK_EVERY,
+                 history_file=PLANNER_HISTORY_FILE):
+        self.conn = conn
+        self.history_file = history_file
+        self.window = window
+        self.min_runs = min_runs
+        self.redundant_coverage = redundant_coverage
+        self.recheck_every = recheck_every
+        self.round = None
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS query_runs (
+                    keyword TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    round INTEGER NOT NULL,
+                    run_at TEXT NOT NULL,
+                    found INTEGER NOT NULL,
+                    new INTEGER NOT NULL
+                )
+            ''')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS query_runs_query ON query_runs (keyword, location, round)')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS query_jobs (
+                    keyword TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    job_id TEXT NOT NULL,
+                    PRIMARY KEY (keyword, location, job_id)
+                )
+            ''')
+        if not self.last_round():
+            self.load_history()
+
+    def load_history(self):
+        """Fill empty planner tables from the history file, if there is one."""
+        if not self.history_file or not os.path.exists(self.history_file):
+            return
+        try:
+            with open(self.history_file, encoding='utf-8') as f:
+                history = json.load(f)
+            with self.conn:
+                self.conn.executemany(
+                    'INSERT INTO query_runs (keyword, location, round, run_at, found, new) VALUES (?, ?, ?, ?, ?, ?)',
+                    [tuple(run) for run in history['runs']]
+                )
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO query_jobs (keyword, location, job_id) VALUES (?, ?, ?)',
+                    [(keyword, location, job_id) for keyword, location, job_ids in history['jobs'] for job_id in job_ids]
+                )
+            print(f"Loaded query planner history from {self.history_file}")
+        except Exception as e:
+            print(f"Failed to load query planner history: {str(e)}")
+            logging.error(f"Failed to load query planner history: {str(e)}")
+
+    def save_history(self):
+        """Write the last ``window`` runs of every search and the job IDs seen to the history file."""
+        if not self.history_file:
+            return
+        try:
+            runs = [list(row) for row in self.conn.execute('''
+                SELECT keyword, location, round, run_at, found, new FROM query_runs AS r
+                WHERE (SELECT COUNT(*) FROM query_runs AS later WHERE later.keyword = r.keyword
+                       AND later.location = r.location AND later.round > r.round) < ?
+                ORDER BY keyword, location, round
+            ''', (self.window,))]
+            jobs = {}
+            for keyword, location, job_id in self.conn.execute(
+                'SELECT keyword, location, job_id FROM query_jobs ORDER BY keyword, location, job_id'
+            ):
+                jobs.setdefault((keyword, location), []).append(job_id)
+            os.makedirs(os.path.dirname(self.history_file) or '.', exist_ok=True)
+            tmp_path = self.history_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'runs': runs, 'jobs': [[keyword, location, ids] for (keyword, location), ids in jobs.items()]},
+                          f, indent=1)
+            os.replace(tmp_path, self.history_file)
+        except Exception as e:
+            print(f"Failed to save query planner history: {str(e)}")
+            logging.error(f"Failed to save query planner history: {str(e)}")
+
+    def last_round(self):
+        row = self.conn.execute('SELECT MAX(round) FROM query_runs').fetchone()
+        return row[0] or 0
+
+    def history(self, keyword, location):
+        """Return the last ``window`` runs of a search as (round, found, new), newest first."""
+        return self.conn.execute(
+            'SELECT round, found, new FROM query_runs WHERE keyword = ? AND location = ? '
+            'ORDER BY round DESC LIMIT ?',
+            (keyword, location, self.window)
+        ).fetchall()
+
+    def job_ids(self, keyword, location):
+        return {row[0] for row in self.conn.execute(
+            'SELECT job_id FROM query_jobs WHERE keyword = ? AND location = ?', (keyword, location)
+        )}
+
+    def plan(self, keywords, locations):
+        """Return the (keyword, location) work items to run this time, best first."""
+        self.round = self.last_round() + 1
+
+        unique = []
+        for keyword in keywords:
+            query = normalize_query(keyword)
+            if query and query not in unique:
+                unique.append(query)
+        duplicates = len(keywords) - len(unique)
+
+        candidates = []
+        for query in unique:
+            for location in locations:
+                history = self.history(query, location)
+                # Searches with no history yet run first so their yield gets measured
+                expected = sum(new for _, _, new in history) / len(history) if history else float('inf')
+                candidates.append((expected, query, location, history))
+        candidates.sort(key=lambda candidate: -candidate[0])
+
+        work_items, skipped = [], []
+        covered = {}
+        for expected, query, location, history in candidates:
+            ids = self.job_ids(query, location)
+            seen_by_others = covered.setdefault(location, set())
+            due = not history or self.round - history[0][0] >= self.recheck_every
+            if len(history) >= self.min_runs and not due:
+                # A search that has never returned a job is not covered by anything
+                coverage = len(ids & seen_by_others) / len(ids) if ids else 0.0
+                if coverage >= self.redundant_coverage:
+                    skipped.append((query, location, f'{coverage:.0%} covered by other searches'))
+                    continue
+                if not any(new for _, _, new in history):
+                    skipped.append((query, location, f'no new jobs in the last {len(history)} runs'))
+                    continue
+            work_items.append((query, location))
+            seen_by_others |= ids
+
+        print(f"Query plan (run {self.round}): {len(work_items)} searches, "
+              f"{len(skipped)} skipped, {duplicates} duplicate keywords dropped")
+        for query, location, reason in skipped:
+            print(f"  skip '{query}' ({location}): {reason}")
+        return work_items
+
+    def record(self, results, run_at=None):
+        """Store this run's (keyword, location, job_ids, new_count) search results."""
+        if self.round is None:
+            self.round = self.last_round() + 1
+        run_at = run_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # A resumed search reports its replayed and its new pages separately
+        merged = {}
+        for keyword, location, job_ids, new_count in results:
+            entry = merged.setdefault((normalize_query(keyword), location), [[], 0])
+            entry[0].extend(job_ids)
+            entry[1] += new_count
+        with self.conn:
+            for (query, location), (job_ids, new_count) in merged.items():
+                self.conn.execute(
+                    'INSERT INTO query_runs (keyword, location, round, run_at, found, new) VALUES (?, ?, ?, ?, ?, ?)',
+                    (query, location, self.round, run_at, len(set(job_ids)), new_count)
+                )
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO query_jobs (keyword, location, job_id) VALUES (?, ?, ?)',
+                    [(query, location, job_id) for job_id in job_ids]
+                )
+        self.save_history()
@@ -0,0 +1,171 @@
+import time
+import random
+import logging
+import threading
+from config import (
+    RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS,
+    RATE_MAX_RETRIES, RATE_RECOVERY_SUCCESSES, EMPTY_PAGES_BEFORE_BACKOFF
+)
+
+# Redirect targets that mean LinkedIn is challenging or refusing us
+THROTTLE_URL_MARKERS = ('authwall', 'checkpoint')
+RETRY_STATUS_CODES = (429, 503)
+
+
+class RateController:
+    """Token bucket that paces every navigation and HTTP fetch, with adaptive backoff.
+
+    Requests take a token from a bucket refilled at ``rate`` per second and
+    holding at most ``burst`` tokens. A throttling signal (a 429, an
+    authwall/checkpoint redirect, or several empty result pages in a row)
+    pauses all requests for an exponentially growing, jittered delay and
+    halves the rate; every ``recovery_successes`` successful requests raise
+    it by a quarter until it is back at the configured rate. A rate of 0
+    disables pacing.
+    """
+
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST, backoff_base=BACKOFF_BASE_SECONDS,
+                 backoff_max=BACKOFF_MAX_SECONDS, max_retries=RATE_MAX_RETRIES,
+                 recovery_successes=RATE_RECOVERY_SUCCESSES, empty_pages=EMPTY_PAGES_BEFORE_BACKOFF):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retries = max_retries
+        self.recovery_successes = recovery_successes
+        self.empty_pages = empty_pages
+        self.workers = 1
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.failures = 0
+        self.successes = 0
+        self.consecutive_empty = 0
+        self.lock = threading.Lock()
+
+    def share(self, workers):
+        """Split the configured rate between ``workers`` processes pacing independently."""
+        with self.lock:
+            self.workers = max(workers, 1)
+
+    def acquire(self, metrics=None):
+        """Block until a request may be sent. Returns the seconds spent waiting."""
+        if not self.base_rate:
+            if metrics:
+                metrics.incr('requests')
+            return 0.0
+        start = time.monotonic()
+        slept = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                rate = self.rate / self.workers
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * rate)
+                self.updated = now
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                else:
+                    delay = (1 - self.tokens) / rate
+            time.sleep(delay)
+            slept = True
+        waited = time.monotonic() - start
+        if metrics:
+            metrics.incr('requests')
+            if slept:
+                metrics.record('rate_wait', waited)
+        return waited
+
+    def succeeded(self):
+        """Note a request that was not throttled, recovering the rate gradually."""
+        with self.lock:
+            self.successes += 1
+            if self.successes >= self.recovery_successes:
+                self.successes = 0
+                self.failures = max(self.failures - 1, 0)
+                self.rate = min(self.base_rate, self.rate * 1.25)
+
+    def throttled(self, reason, metrics=None, retry_after=None):
+        """Back off after a throttling signal. Returns the pause in seconds."""
+        with self.lock:
+            self.failures += 1
+            self.successes = 0
+            self.consecutive_empty = 0
+            delay = min(self.backoff_base * 2 ** (self.failures - 1), self.backoff_max)
+            # Full jitter keeps parallel workers from retrying in lockstep
+            delay = random.uniform(delay / 2, delay)
+            if retry_after:
+                delay = max(delay, retry_after)
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            if self.base_rate:
+                self.rate = max(self.rate / 2, self.base_rate / 16)
+            self.tokens = 0.0
+        print(f"Throttled ({reason}), backing off {delay:.1f}s")
+        logging.warning(f"Throttled ({reason}), backing off {delay:.1f}s")
+        if metrics:
+            metrics.incr('throttle_events')
+            metrics.record('backoff', delay, reason=reason)
+        return delay
+
+    def results_page(self):
+        """Note a results page with jobs on it, ending a run of empty pages."""
+        with self.lock:
+            self.consecutive_empty = 0
+
+    def empty_page(self, metrics=None):
+        """Note an empty first results page; several in a row count as throttling."""
+        with self.lock:
+            self.consecutive_empty += 1
+            throttle = self.consecutive_empty >= self.empty_pages
+        if throttle:
+            self.throttled('empty_pages', metrics)
+
+    def get(self, session, url, metrics=None, **kwargs):
+        """``session.get`` paced by the bucket, retrying 429/503 answers after backing off."""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(metrics)
+            response = session.get(url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES:
+                if any(marker in response.url.lower() for marker in THROTTLE_URL_MARKERS):
+                    self.throttled('authwall', metrics)
+                else:
+                    self.succeeded()
+                return response
+            retry_after = response.headers.get('Retry-After', '')
+            self.throttled(f'http_{response.status_code}', metrics,
+                           float(retry_after) if retry_after.isdigit() else None)
+            if attempt < self.max_retries and metrics:
+                metrics.incr('retries')
+        return response
+
+    def navigate(self, driver, url, metrics=None):
+        """``driver.get`` paced by the bucket, retrying authwall/checkpoint redirects.
+
+        Returns False if the last attempt still landed on a challenge page.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(metrics)
+            driver.get(url)
+            if not any(marker in driver.current_url.lower() for marker in THROTTLE_URL_MARKERS):
+                self.succeeded()
+                return True
+            self.throttled('authwall', metrics)
+            if attempt < self.max_retries and metrics:
+                metrics.incr('retries')
+        return False
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def rate_controller():
+    """Return the rate controller shared by everything in this process."""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = RateController()
+        return _controller
@@ -0,0 +1,120 @@
+import os
+import json
+import glob
+import time
+import threading
+from config import JOURNAL_DIR, JOURNAL_MAX_AGE_HOURS
+
+
+class RunJournal:
+    """Write-ahead journal of the current run's extracted jobs and finished pages.
+
+    Every results page is appended as one JSON line holding its jobs and the
+    offset to continue from, and flushed to disk before the jobs are used.
+    Each writer (the main scraper or a worker) appends to its own segment
+    file, so threads and processes never share a file handle. The journal is
+    cleared once the run's jobs are safely in storage; if a run dies first,
+    the next run replays it and resumes each search where it stopped.
+    """
+
+    def __init__(self, directory=JOURNAL_DIR, segment='main'):
+        self.directory = directory
+        self.segment = segment
+        self.lock = threading.Lock()
+        self.file = None
+        self.pages = {}
+        self.done = set()
+        self.jobs = []
+        self.found = {}
+        self.resumable = False
+
+    def __getstate__(self):
+        # Worker processes get a fresh writer for the same directory and the resume state
+        return {'directory': self.directory, 'segment': self.segment, 'pages': self.pages, 'done': self.done}
+
+    def __setstate__(self, state):
+        self.__init__(state['directory'], state['segment'])
+        self.pages, self.done = state['pages'], state['done']
+
+    def for_worker(self, name):
+        """Return a journal writing to its own segment in the same directory.
+
+        It shares the loaded resume state, so workers also skip finished
+        slices of split searches.
+        """
+        journal = RunJournal(self.directory, f'{self.segment}-{name}')
+        journal.pages, journal.done = self.pages, self.done
+        return journal
+
+    def segment_files(self):
+        return sorted(glob.glob(os.path.join(self.directory, '*.jsonl')))
+
+    def load(self, max_age_hours=JOURNAL_MAX_AGE_HOURS):
+        """Read what an interrupted run left behind. Returns the number of journaled jobs.
+
+        Journals older than ``max_age_hours`` still replay their jobs, but
+        their searches are run again instead of being resumed.
+        """
+        files = self.segment_files()
+        if not files:
+            return 0
+        newest = max(os.path.getmtime(path) for path in files)
+        self.resumable = time.time() - newest <= max_age_hours * 3600
+        for path in files:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn line from the crash; skip it and keep the records around it
+                        continue
+                    key = (record['keyword'], record['location'])
+                    if record['type'] == 'page':
+                        self.jobs.extend(record['jobs'])
+                        self.found.setdefault(key, []).extend(job['job_id'] for job in record['jobs'])
+                        self.pages[key] = max(self.pages.get(key, 0), record['next_start'])
+                    elif record['type'] == 'done':
+                        self.done.add(key)
+        if not self.resumable:
+            self.pages, self.done, self.found = {}, set(), {}
+        return len(self.jobs)
+
+    def is_done(self, keyword, location):
+        return (keyword, location) in self.done
+
+    def next_start(self, keyword, location):
+        """Return the result offset an interrupted search should continue from."""
+        return self.pages.get((keyword, location), 0)
+
+    def append(self, record):
+        with self.lock:
+            if self.file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                # PIDs repeat across container runs, so every writer starts a new file
+                path = os.path.join(self.directory, f'{self.segment}-{os.getpid()}-{time.time_ns()}.jsonl')
+                self.file = open(path, 'a', encoding='utf-8')
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def record_page(self, keyword, location, next_start, jobs):
+        """Journal one results page before its jobs are used."""
+        self.append({'type': 'page', 'keyword': keyword, 'location': location,
+                     'next_start': next_start, 'jobs': jobs})
+
+    def record_done(self, keyword, location):
+        """Mark a search as finished so a resumed run skips it."""
+        self.append({'type': 'done', 'keyword': keyword, 'location': location})
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+    def clear(self):
+        """Delete the journal once the run's jobs are in storage."""
+        self.close()
+        for path in self.segment_files():
+            os.remove(path)
+        self.pages, self.done, self.jobs, self.found = {}, set(), [], {}
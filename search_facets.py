@@ -0,0 +1,93 @@
+import re
+from itertools import product
+from urllib.parse import urlencode, parse_qsl
+from config import LOCATIONS, SEARCH_FACETS, SEARCH_TIME_RANGE, SEARCH_SORT, SPLIT_FACETS, SPLIT_LOCATIONS
+
+# A search scope is the string form of a search's filters. A plain location
+# ('Israel') is a scope on its own; anything more is a sorted query string
+# ('f_E=1&location=Israel'), so scopes are stable keys for the planner and journal.
+
+
+def build_scope(params):
+    """Return the scope string for a dict of search filters."""
+    params = {key: str(value) for key, value in params.items() if value not in (None, '')}
+    if set(params) == {'location'}:
+        return params['location']
+    return urlencode(sorted(params.items()))
+
+
+def scope_filters(scope):
+    """Return the filters a scope string stands for."""
+    if '=' not in scope:
+        # A bare number is a LinkedIn geoId, anything else a location name
+        return {'geoId': scope} if scope.isdigit() else {'location': scope}
+    return dict(parse_qsl(scope))
+
+
+def search_params(scope):
+    """Return the URL parameters for a scope, adding the default time range and sort order."""
+    params = scope_filters(scope or LOCATIONS[0])
+    if SEARCH_TIME_RANGE:
+        params.setdefault('f_TPR', SEARCH_TIME_RANGE)
+    params.setdefault('sortBy', SEARCH_SORT)
+    return params
+
+
+def scope_label(scope):
+    """Return a short human-readable form of a scope."""
+    filters = scope_filters(scope)
+    place = filters.pop('location', None) or filters.pop('geoId', None) or ''
+    return ', '.join([place] + [f'{key}={value}' for key, value in sorted(filters.items())])
+
+
+def search_scopes(locations=LOCATIONS, facets=SEARCH_FACETS):
+    """Return one scope per combination of location and configured facet values."""
+    names = [name for name, values in facets.items() if values]
+    scopes = []
+    for location in locations:
+        base = scope_filters(str(location))
+        for values in product(*(facets[name] for name in names)):
+            scopes.append(build_scope(dict(base, **dict(zip(names, values)))))
+    return scopes
+
+
+def is_base_location(scope):
+    """Return True for a configured location searched without any filters."""
+    return (scope or LOCATIONS[0]) in [str(location) for location in LOCATIONS]
+
+
+def scope_root(scope, roots):
+    """Return the scope in ``roots`` that ``scope`` was split from (or ``scope`` itself)."""
+    filters = scope_filters(scope)
+    for root in roots:
+        root_filters = scope_filters(root)
+        cities = SPLIT_LOCATIONS.get(root_filters.get('location')) or []
+        if all(filters.get(key) == value or (key == 'location' and filters.get(key) in cities)
+               for key, value in root_filters.items()):
+            return root
+    return scope
+
+
+def split_scope(scope):
+    """Partition a scope on the next facet it does not fix yet. Returns [] when nothing is left.
+
+    The slices are disjoint but not complete: a posting with no value for
+    the facet (e.g. seniority "Not applicable") matches none of them, and
+    city slices only cover the listed cities. The caller pages on through
+    the unsplit search afterwards to pick those up.
+    """
+    filters = scope_filters(scope)
+    for facet, values in SPLIT_FACETS:
+        if facet == 'location':
+            cities = SPLIT_LOCATIONS.get(filters.get('location'))
+            if cities:
+                return [build_scope(dict(filters, location=city)) for city in cities]
+        elif facet not in filters:
+            return [build_scope(dict(filters, **{facet: value})) for value in values]
+    return []
+
+
+def parse_result_count(text):
+    """Return the count from text like '1,234 results' or '1000+ results', or None."""
+    match = re.search(r'(\d[\d,.]*)\+?\s*result', text or '')
+    return int(re.sub(r'[,.]', '', match.group(1))) if match else None
@@ -0,0 +1,97 @@
+import os
+import json
+import glob
+from datetime import datetime
+from job_store import JOB_COLUMNS, job_key, canonical_link
+from config import SHARDS_DIR, SNAPSHOTS_DIR, EXCEL_FILE, NEAR_DUPLICATES
+
+
+def to_record(job, seen_at):
+    """Return the shard record for a job."""
+    job_id = job.get('job_id') or job_key(job.get('link'))
+    record = {'job_id': job_id}
+    record.update({column: job.get(column) for column in JOB_COLUMNS})
+    record['link'] = canonical_link(job_id, job.get('link'))
+    record['first_seen'] = seen_at
+    return record
+
+
+def write_shard(jobs, seen_at, directory=SHARDS_DIR):
+    """Write the new jobs of one run to a dated JSONL shard. Returns its path."""
+    if not jobs:
+        return None
+    timestamp = datetime.strptime(seen_at, '%Y-%m-%d %H:%M:%S')
+    shard_dir = os.path.join(directory, timestamp.strftime('%Y-%m-%d'))
+    os.makedirs(shard_dir, exist_ok=True)
+    path = os.path.join(shard_dir, f"run-{timestamp.strftime('%H%M%S')}.jsonl")
+    with open(path, 'a', encoding='utf-8') as f:
+        for job in jobs:
+            f.write(json.dumps(to_record(job, seen_at), ensure_ascii=False, sort_keys=True) + '\n')
+    return path
+
+
+def read_records(path):
+    """Yield the records of one shard or snapshot file."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def shard_files(directory=SHARDS_DIR):
+    """Return all shard files, oldest first."""
+    return sorted(glob.glob(os.path.join(directory, '*', '*.jsonl')))
+
+
+def snapshot_files(directory=SNAPSHOTS_DIR):
+    """Return all monthly snapshot files, oldest first."""
+    return sorted(glob.glob(os.path.join(directory, '*.jsonl')))
+
+
+def iter_records():
+    """Yield every stored record: monthly snapshots first, then per-run shards."""
+    for path in snapshot_files() + shard_files():
+        yield from read_records(path)
+
+
+def compact(now=None, excel_file=EXCEL_FILE):
+    """Merge shards of finished months into monthly snapshots and regenerate the xlsx."""
+    current_month = (now or datetime.now()).strftime('%Y-%m')
+    by_month = {}
+    for path in shard_files():
+        month = os.path.basename(os.path.dirname(path))[:7]
+        if month < current_month:
+            by_month.setdefault(month, []).append(path)
+
+    os.makedirs(SNAPSHOTS_DIR, exist_ok=True)
+    for month, paths in sorted(by_month.items()):
+        snapshot = os.path.join(SNAPSHOTS_DIR, f'{month}.jsonl')
+        records = {}
+        for path in ([snapshot] if os.path.exists(snapshot) else []) + paths:
+            for record in read_records(path):
+                existing = records.get(record['job_id'])
+                if existing is None or record['first_seen'] < existing['first_seen']:
+                    records[record['job_id']] = record
+        tmp_path = snapshot + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for job_id in sorted(records):
+                f.write(json.dumps(records[job_id], ensure_ascii=False, sort_keys=True) + '\n')
+        os.replace(tmp_path, snapshot)
+        for path in paths:
+            os.remove(path)
+            shard_dir = os.path.dirname(path)
+            if not os.listdir(shard_dir):
+                os.rmdir(shard_dir)
+        print(f"Compacted {len(paths)} shards into {snapshot} ({len(records)} jobs)")
+
+    from job_store import JobStore
+    store = JobStore()
+    try:
+        if NEAR_DUPLICATES:
+            from near_duplicates import NearDuplicateIndex
+            NearDuplicateIndex(store.conn).index_pending()
+        store.export_excel(excel_file)
+        print(f"Exported {len(store)} jobs to {excel_file}")
+    finally:
+        store.close()
+    return sorted(by_month)
@@ -0,0 +1,176 @@
+import json
+import logging
+from job_store import JOB_COLUMNS, job_key
+from config import GOOGLE_SHEET_URL, GOOGLE_CREDENTIALS_FILE, SHEETS_WORKSHEET_INDEX
+
+SHEETS_HEADER = ['job_id'] + JOB_COLUMNS + ['scraped_date']
+# Google Sheets rejects cells longer than this
+MAX_CELL_LENGTH = 50000
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+
+
+def open_worksheet(sheet_url=GOOGLE_SHEET_URL, credentials_file=GOOGLE_CREDENTIALS_FILE,
+                   index=SHEETS_WORKSHEET_INDEX, client=None):
+    """Open a worksheet with a service account; pass ``client`` to reuse an authorized one."""
+    if client is None:
+        import gspread
+        from google.oauth2.service_account import Credentials
+        creds = Credentials.from_service_account_file(credentials_file, scopes=SCOPES)
+        client = gspread.authorize(creds)
+    return client.open_by_url(sheet_url).get_worksheet(index)
+
+
+class MemoryWorksheet:
+    """In-memory stand-in for a gspread worksheet, for dry runs and benchmarks."""
+
+    def __init__(self, rows=None, title='Sheet1'):
+        self.title = title
+        self.rows = [list(row) for row in rows or []]
+        self.calls = []
+
+    def row_values(self, row):
+        self.calls.append('row_values')
+        return list(self.rows[row - 1]) if row <= len(self.rows) else []
+
+    def col_values(self, col):
+        self.calls.append('col_values')
+        return [row[col - 1] if col <= len(row) else '' for row in self.rows]
+
+    def append_rows(self, values, value_input_option='RAW', table_range=None):
+        self.calls.append('append_rows')
+        start = len(self.rows) + 1
+        self.rows.extend([list(row) for row in values])
+        return {'updates': {'updatedRange': f'{self.title}!A{start}:A{len(self.rows)}',
+                            'updatedRows': len(values)}}
+
+
+class SheetsSink:
+    """Appends a run's new jobs to a Google Sheet in a single ``append_rows`` call.
+
+    The sheet's header, the next free row and the job IDs already written are
+    cached in the job database (or in memory without ``conn``), so a write
+    never downloads the sheet. The sheet is read once, when there is no
+    cache for it yet.
+    """
+
+    def __init__(self, conn=None, worksheet=None, sheet_url=GOOGLE_SHEET_URL, client=None, sheet_key=None):
+        self.conn = conn
+        self.sheet_url = sheet_url
+        self.client = client
+        self.worksheet = worksheet
+        # Cache entries are per sheet, so pointing at another sheet starts a fresh cursor
+        self.sheet_key = sheet_key or f'{sheet_url}#{SHEETS_WORKSHEET_INDEX}'
+        self.header = None
+        self.next_row = None
+        self.written = set()
+        if self.conn:
+            with self.conn:
+                self.conn.execute('''
+                    CREATE TABLE IF NOT EXISTS sheets_state (
+                        sheet_key TEXT PRIMARY KEY,
+                        header TEXT NOT NULL,
+                        next_row INTEGER NOT NULL
+                    )
+                ''')
+                self.conn.execute('''
+                    CREATE TABLE IF NOT EXISTS sheets_rows (
+                        sheet_key TEXT NOT NULL,
+                        job_id TEXT NOT NULL,
+                        row INTEGER,
+                        PRIMARY KEY (sheet_key, job_id)
+                    )
+                ''')
+
+    def get_worksheet(self):
+        if self.worksheet is None:
+            self.worksheet = open_worksheet(self.sheet_url, client=self.client)
+        return self.worksheet
+
+    def load_state(self):
+        """Load the cached header and cursor, reading the sheet only if nothing is cached."""
+        if self.header is not None:
+            return
+        if self.conn:
+            row = self.conn.execute(
+                'SELECT header, next_row FROM sheets_state WHERE sheet_key = ?', (self.sheet_key,)
+            ).fetchone()
+            if row:
+                self.header, self.next_row = json.loads(row[0]), row[1]
+                return
+
+        # First write to this sheet: read the header and the ID column once
+        worksheet = self.get_worksheet()
+        self.header = worksheet.row_values(1)
+        if self.header:
+            id_column = 'job_id' if 'job_id' in self.header else 'link'
+            values = worksheet.col_values(self.header.index(id_column) + 1) if id_column in self.header else []
+            ids = [value if id_column == 'job_id' else job_key(value) for value in values[1:] if value]
+            self.next_row = len(values) + 1
+            self.remember(ids, None)
+        else:
+            self.next_row = 1
+        self.save_state()
+
+    def save_state(self):
+        if self.conn:
+            with self.conn:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO sheets_state (sheet_key, header, next_row) VALUES (?, ?, ?)',
+                    (self.sheet_key, json.dumps(self.header), self.next_row)
+                )
+
+    def remember(self, job_ids, first_row):
+        """Record job IDs as written, starting at ``first_row`` when it is known."""
+        self.written.update(job_ids)
+        if self.conn:
+            with self.conn:
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO sheets_rows (sheet_key, job_id, row) VALUES (?, ?, ?)',
+                    [(self.sheet_key, job_id, first_row + i if first_row else None)
+                     for i, job_id in enumerate(job_ids)]
+                )
+
+    def is_written(self, job_id):
+        if job_id in self.written:
+            return True
+        return bool(self.conn and self.conn.execute(
+            'SELECT 1 FROM sheets_rows WHERE sheet_key = ? AND job_id = ?', (self.sheet_key, job_id)
+        ).fetchone())
+
+    def to_row(self, job, seen_at):
+        values = dict(job, job_id=job.get('job_id') or job_key(job.get('link')), scraped_date=seen_at)
+        row = []
+        for column in self.header:
+            value = values.get(column)
+            row.append('' if value is None else str(value)[:MAX_CELL_LENGTH])
+        return row
+
+    def write(self, jobs, seen_at):
+        """Append jobs whose IDs are not in the sheet yet. Returns how many rows were written."""
+        self.load_state()
+        rows, job_ids = [], []
+        if not self.header:
+            self.header = list(SHEETS_HEADER)
+            rows.append(self.header)
+        for job in jobs:
+            job_id = job.get('job_id') or job_key(job.get('link'))
+            if job_id in job_ids or self.is_written(job_id):
+                continue
+            job_ids.append(job_id)
+            rows.append(self.to_row(job, seen_at))
+        if not job_ids:
+            return 0
+
+        response = self.get_worksheet().append_rows(rows, value_input_option='RAW', table_range='A1')
+        start = self.next_row
+        try:
+            # The API reports where the rows actually landed, e.g. 'Sheet1!A12:K14'
+            updated = response['updates']['updatedRange'].split('!')[-1].split(':')
+            start = int(''.join(ch for ch in updated[0] if ch.isdigit()))
+        except Exception:
+            logging.warning("Could not read the appended range, using the cached row cursor")
+        self.next_row = start + len(rows)
+        first_job_row = start + (len(rows) - len(job_ids))
+        self.remember(job_ids, first_job_row)
+        self.save_state()
+        return len(job_ids)
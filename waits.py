@@ -0,0 +1,110 @@
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+# Resource Timing entries seen so far; stops changing once the network is idle
+RESOURCE_COUNT_SCRIPT = "return performance.getEntriesByType('resource').length;"
+
+
+def element_present(selector):
+    """At least one element matches ``selector``; returns the first match."""
+    def condition(driver):
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        return elements[0] if elements else False
+    return condition
+
+
+def text_present(selector, text):
+    """An element matching ``selector`` contains ``text``."""
+    def condition(driver):
+        return any(text in element.text for element in driver.find_elements(By.CSS_SELECTOR, selector))
+    return condition
+
+
+def any_of(**conditions):
+    """The first named condition that holds; returns its name."""
+    def condition(driver):
+        for name, check in conditions.items():
+            if check(driver):
+                return name
+        return False
+    return condition
+
+
+def stable(read_value, settle=0.5, accept=lambda value: True):
+    """``read_value(driver)`` has not changed for ``settle`` seconds; returns the value."""
+    state = {'value': None, 'since': None}
+
+    def condition(driver):
+        value = read_value(driver)
+        now = time.monotonic()
+        if value != state['value'] or state['since'] is None:
+            state['value'], state['since'] = value, now
+            return False
+        if now - state['since'] >= settle and accept(value):
+            return value
+        return False
+    return condition
+
+
+def element_count_stable(selector, settle=0.5, minimum=1):
+    """The number of elements matching ``selector`` is at least ``minimum`` and stable."""
+    return stable(
+        lambda driver: len(driver.find_elements(By.CSS_SELECTOR, selector)),
+        settle, lambda count: count >= minimum
+    )
+
+
+def network_idle(settle=0.5):
+    """No new resources have been fetched for ``settle`` seconds."""
+    return stable(lambda driver: driver.execute_script(RESOURCE_COUNT_SCRIPT), settle)
+
+
+class WaitRecorder:
+    """Waits on readiness conditions and records how long each wait took."""
+
+    def __init__(self, poll_frequency=0.1, callback=None):
+        self.poll_frequency = poll_frequency
+        self.callback = callback
+        self.records = []
+
+    def wait(self, driver, name, condition, timeout):
+        """Wait until ``condition`` holds, returning its value.
+
+        Raises ``TimeoutException`` like ``WebDriverWait`` after ``timeout`` seconds.
+        """
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+            self.add_record(name, time.perf_counter() - start, True)
+            return result
+        except TimeoutException:
+            self.add_record(name, time.perf_counter() - start, False)
+            raise
+
+    def add_record(self, name, seconds, ok):
+        self.records.append((name, seconds, ok))
+        if self.callback:
+            self.callback(name, seconds, ok)
+
+    def reset(self):
+        """Forget the recorded waits, e.g. at the start of a run."""
+        self.records = []
+
+    def summary(self):
+        """Return count, total, max and timeouts per wait name."""
+        summary = {}
+        for name, seconds, ok in self.records:
+            entry = summary.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0})
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            entry['timeouts'] += 0 if ok else 1
+        return summary
+
+    def print_summary(self):
+        """Print how long each kind of wait took."""
+        for name, entry in sorted(self.summary().items()):
+            print(f"  wait {name}: {entry['count']}x, total {entry['total']:.2f}s, "
+                  f"max {entry['max']:.2f}s, {entry['timeouts']} timeouts")
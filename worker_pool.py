@@ -0,0 +1,139 @@
+import logging
+import multiprocessing
+import queue
+import threading
+from linkedin_scraper import create_scraper, dedupe_jobs
+from rate_control import rate_controller
+from config import NUM_WORKERS, WORKER_BACKEND
+
+# How often the parent checks that worker processes are still alive while waiting for results
+RESULT_POLL_SECONDS = 5
+
+
+def _drain(scraper, task_queue, results, lock, known_ids, deadline=None):
+    """Pull work items off the queue until the stop sentinel, collecting jobs."""
+    while True:
+        item = task_queue.get()
+        if item is None:
+            return
+        jobs = scraper.crawl([item], known_ids, deadline)
+        with lock:
+            results.extend(jobs)
+
+
+def _thread_worker(session_state, task_queue, results, lock, known_ids, primary, deadline=None):
+    """Run one browser session in a thread, reusing the shared login."""
+    scraper = None
+    try:
+        scraper = create_scraper(primary=False)
+        if primary.journal:
+            scraper.journal = primary.journal.for_worker(f'thread{threading.get_ident()}')
+        if scraper.apply_session_state(session_state):
+            _drain(scraper, task_queue, results, lock, known_ids, deadline)
+    except Exception as e:
+        print(f"Worker failed: {str(e)}")
+        logging.error(f"Worker failed: {str(e)}")
+    finally:
+        if scraper:
+            primary.metrics.merge(scraper.metrics.snapshot())
+            with lock:
+                primary.query_results.extend(scraper.query_results)
+            if scraper.journal:
+                scraper.journal.close()
+            scraper.close()
+
+
+def _process_worker(session_state, task_queue, result_queue, known_ids, deadline=None, journal=None, processes=1):
+    """Run one browser session in a child process, reusing the shared login."""
+    rate_controller().share(processes)
+    jobs = []
+    lock = threading.Lock()
+    scraper = None
+    try:
+        scraper = create_scraper(primary=False)
+        if journal:
+            scraper.journal = journal.for_worker('process')
+        if scraper.apply_session_state(session_state):
+            _drain(scraper, task_queue, jobs, lock, known_ids, deadline)
+    except Exception as e:
+        print(f"Worker failed: {str(e)}")
+        logging.error(f"Worker failed: {str(e)}")
+    finally:
+        snapshot, query_results = None, []
+        if scraper:
+            snapshot, query_results = scraper.metrics.snapshot(), scraper.query_results
+            if scraper.journal:
+                scraper.journal.close()
+            scraper.close()
+        result_queue.put((jobs, snapshot, query_results))
+
+
+def crawl_parallel(scraper, work_items, known_ids=None, num_workers=NUM_WORKERS, backend=WORKER_BACKEND,
+                   deadline=None):
+    """Crawl work items with a pool of browser sessions sharing one login.
+
+    The already logged-in ``scraper`` takes part as one of the workers; the
+    other ``num_workers - 1`` sessions start from its cookies.
+    """
+    session_state = scraper.get_session_state()
+    extra_workers = max(min(num_workers, len(work_items)) - 1, 0)
+    print(f"Crawling {len(work_items)} work items with {extra_workers + 1} workers ({backend})")
+
+    results = []
+    lock = threading.Lock()
+
+    if backend == 'process':
+        task_queue = multiprocessing.Queue()
+        result_queue = multiprocessing.Queue()
+        for item in work_items + [None] * (extra_workers + 1):
+            task_queue.put(item)
+        workers = [
+            multiprocessing.Process(
+                target=_process_worker, args=(session_state, task_queue, result_queue, known_ids, deadline, scraper.journal,
+                      extra_workers + 1)
+            )
+            for _ in range(extra_workers)
+        ]
+        # Each process paces itself, so they split the configured rate
+        rate_controller().share(extra_workers + 1)
+        for worker in workers:
+            worker.start()
+        _drain(scraper, task_queue, results, lock, known_ids, deadline)
+        pending = len(workers)
+        while pending:
+            try:
+                jobs, snapshot, query_results = result_queue.get(timeout=RESULT_POLL_SECONDS)
+            except queue.Empty:
+                # A killed process (OOM, crash) never reports; stop waiting once none is left
+                if not any(worker.is_alive() for worker in workers):
+                    print(f"{pending} worker process(es) exited without reporting results")
+                    logging.error(f"{pending} worker process(es) exited without reporting results")
+                    break
+                continue
+            pending -= 1
+            results.extend(jobs)
+            scraper.query_results.extend(query_results)
+            if snapshot:
+                scraper.metrics.merge(snapshot)
+        for worker in workers:
+            worker.join()
+        rate_controller().share(1)
+    else:
+        task_queue = queue.Queue()
+        for item in work_items + [None] * (extra_workers + 1):
+            task_queue.put(item)
+        workers = [
+            threading.Thread(
+                target=_thread_worker,
+                args=(session_state, task_queue, results, lock, known_ids, scraper, deadline),
+                daemon=True
+            )
+            for _ in range(extra_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        _drain(scraper, task_queue, results, lock, known_ids, deadline)
+        for worker in workers:
+            worker.join()
+
+    return dedupe_jobs(results)